@@ -7,11 +7,30 @@ Enhanced dengan Multi-modal capabilities dan Advanced Content Generation
 
 import os
 import sys
+import asyncio
 import json
 import time
+import random
+import re
+import hashlib
+import dataclasses
+import functools
+import math
+import operator
+import importlib.util
+import itertools
+import sqlite3
+import threading
+import uuid
+import shutil
+import subprocess
+from array import array
+from collections import deque
 from pathlib import Path
-from typing import Optional, Dict, Any, List
-import argparse
+from stat import S_ISREG
+from types import MappingProxyType
+from typing import Optional, Dict, Any, List, Iterator
+from concurrent.futures import ThreadPoolExecutor
 from colorama import init, Fore, Style
 
 # Initialize colorama
@@ -25,22 +44,1001 @@ try:
 except ImportError:
     DOTENV_AVAILABLE = False
 
+# Tanpa python-dotenv, file .env tidak pernah dibaca: arahkan user ke environment variable
+if DOTENV_AVAILABLE:
+    _API_KEY_HINT = "Buat file .env dengan GEMINI_API_KEY=your_actual_api_key"
+else:
+    _API_KEY_HINT = ("python-dotenv tidak terinstall, file .env diabaikan: "
+                     "pip install python-dotenv atau export GEMINI_API_KEY=your_actual_api_key")
+
+# google.generativeai (gRPC/protobuf) berat di-import, jadi baru di-load lewat _load_genai()
 try:
-    import google.generativeai as genai
-    GENAI_AVAILABLE = True
+    GENAI_AVAILABLE = importlib.util.find_spec("google.generativeai") is not None
 except ImportError:
     GENAI_AVAILABLE = False
+genai = None
+
+# Error transient dari Gemini (429/503) yang layak di-retry, diisi oleh _load_genai()
+RETRYABLE_ERRORS = ()
+
+def _load_genai():
+    """Import google.generativeai saat pertama kali dibutuhkan"""
+    global genai, RETRYABLE_ERRORS
+    if genai is None:
+        import google.generativeai as genai_module
+        try:
+            from google.api_core.exceptions import ResourceExhausted, ServiceUnavailable
+            RETRYABLE_ERRORS = (ResourceExhausted, ServiceUnavailable)
+        except ImportError:
+            pass
+        genai = genai_module
+    return genai
+
+def _module_available(name: str) -> bool:
+    """Cek module terinstall tanpa meng-import-nya"""
+    try:
+        return importlib.util.find_spec(name) is not None
+    except (ImportError, ValueError):
+        return False
+
+# OpenCV/numpy dan decode backend (decord, PyAV) berat di-import,
+# jadi baru di-load lewat _load_video_libs() saat ada video yang diproses
+CV2_AVAILABLE = _module_available("cv2") and _module_available("numpy")
+DECORD_AVAILABLE = _module_available("decord")
+AV_AVAILABLE = _module_available("av")
+cv2 = np = decord = av = None
+
+# PyAV >= 14: hardware decode (CUDA) dengan fallback ke software decoder, diisi oleh _load_video_libs()
+_PYAV_HWACCEL = None
+
+def _load_video_libs() -> bool:
+    """Import OpenCV, numpy dan decode backend saat pertama kali dibutuhkan"""
+    global cv2, np, decord, av, _PYAV_HWACCEL, CV2_AVAILABLE, DECORD_AVAILABLE, AV_AVAILABLE
+    if cv2 is not None:
+        return True
+    
+    try:
+        import numpy as np_module
+        import cv2 as cv2_module
+    except ImportError:
+        CV2_AVAILABLE = False
+        return False
+    
+    # Optional decode backends yang lebih cepat untuk sparse frame sampling
+    if DECORD_AVAILABLE:
+        try:
+            import decord as decord_module
+            decord = decord_module
+        except ImportError:
+            DECORD_AVAILABLE = False
+    
+    if AV_AVAILABLE:
+        try:
+            import av as av_module
+            av = av_module
+        except ImportError:
+            AV_AVAILABLE = False
+        else:
+            try:
+                from av.codec.hwaccel import HWAccel, hwdevices_available
+                if "cuda" in hwdevices_available():
+                    _PYAV_HWACCEL = HWAccel(device_type="cuda", allow_software_fallback=True)
+            except ImportError:
+                pass
+    
+    np = np_module
+    cv2 = cv2_module
+    return True
 
-# Try to import CV2 and PIL for video analysis
 try:
-    import cv2
-    import numpy as np
-    from PIL import Image
-    CV2_AVAILABLE = True
+    import orjson
+    ORJSON_AVAILABLE = True
 except ImportError:
-    CV2_AVAILABLE = False
+    ORJSON_AVAILABLE = False
+
+# Mulai jumlah frame ini, satu proses ffmpeg dengan select filter lebih cepat dari seek per frame
+FFMPEG_BATCH_MIN_FRAMES = 8
+
+# Sisi terpanjang frame (px) yang dikirim ke Gemini; lebih besar dari ini tidak menambah informasi
+FRAME_MAX_EDGE = 1024
+
+# Jumlah frame yang dikirim ke Gemini per analisis video (juga dipakai untuk signature pHash)
+ANALYSIS_NUM_FRAMES = 3
+
+# Jarak antar frame sampel (dalam frame) di atas ini seek ke keyframe lebih cepat dari decode berurutan
+SEEK_MIN_GAP_FRAMES = 300
+
+# Field JSON yang langsung ditampilkan saat response Gemini masih di-stream
+_STREAM_PREVIEW_RE = re.compile(
+    r'"(title|judul|content|konten|setting|target_audience|viral_score|skor_viral)"\s*:\s*"((?:[^"\\]|\\.)*)"'
+)
+# Sisa stream (karakter) yang disimpan untuk menunggu field preview yang belum lengkap
+_STREAM_PREVIEW_MAX_TAIL = 4096
+
+# Teks menu interaktif, dibangun sekali saat import
+# (warna di-reset per baris, sama seperti print terpisah dengan colorama autoreset)
+_MENU_HEADER = (
+    f"\n{Fore.LIGHTMAGENTA_EX}🚀 Gemini 2.0-flash AI Assistant{Style.RESET_ALL}\n"
+    + "=" * 60 + "\n"
+    + f"{Fore.LIGHTCYAN_EX}🎯 Powered by Latest & Most Advanced AI Model{Style.RESET_ALL}\n"
+    "\n"
+)
+_MENU_BANNER = (
+    f"\n{Fore.YELLOW}Pilih aksi:{Style.RESET_ALL}\n"
+    "1. 🎬 Advanced Video Analysis\n"
+    "2. ✍️ Enhanced Text Post Generation\n"
+    "3. 📱 Multi-Platform Content Strategy\n"
+    "4. 🔍 Check API Status & Capabilities\n"
+    "5. 🧹 Cleanup Temp Files\n"
+    "6. ❌ Keluar\n"
+)
+_MENU_PROMPT = f"\n{Fore.WHITE}Pilihan (1-6): "
+
+# Decoder bersama untuk raw_decode di _parse_gemini_json
+_JSON_DECODER = json.JSONDecoder()
+
+# Batas panjang (~1000 token) analysis JSON di prompt platform, lebih dari ini diringkas
+ANALYSIS_PROMPT_BUDGET_CHARS = 4096
+
+# Bagian analysis yang dipakai untuk generate content platform (EN dan ID)
+_PLATFORM_ANALYSIS_KEYS = (
+    "visual_elements", "content_analysis", "viral_potential", "platform_optimization", "content_strategy",
+    "elemen_visual", "analisis_konten", "potensi_viral", "optimasi_platform", "strategi_konten",
+)
+
+# Rata-rata jarak Hamming pHash (dari 64 bit) per frame agar video dianggap near-duplicate (~95% bit sama)
+SIMILAR_FRAME_MAX_DISTANCE = 3
+
+# Text post untuk topik yang mirip secara semantik ("tips diet" vs "tips diet sehat") diambil dari cache
+EMBEDDING_MODEL = "models/text-embedding-004"
+SEMANTIC_CACHE_MIN_SIMILARITY = 0.9
+
+# TTL (detik) text post di cache; lebih pendek dari analysis supaya ide post tetap segar
+TEXT_POST_CACHE_TTL = 24 * 3600
+
+# GEMINI_CACHE_MODE: enabled (default), replay (hanya dari cache, tanpa API call), disabled
+CACHE_MODES = ("enabled", "replay", "disabled")
+
+# TTL (detik) cache hasil check_api_status
+API_STATUS_TTL = 300
+API_STATUS_FAILURE_TTL = 30
+
+# Total waktu tunggu retry (detik) untuk 429/503; check_api_status memakai budget yang lebih pendek
+RETRY_MAX_WAIT = 8.0
+STATUS_RETRY_MAX_WAIT = 2.0
+
+# Delay yang diminta server di pesan error 429 (RetryInfo), mis. "retry_delay { seconds: 17 }"
+_RETRY_DELAY_RE = re.compile(r"retry_delay\s*\{\s*seconds:\s*(\d+)")
+
+@functools.lru_cache(maxsize=64)
+def _stat_cached(path: str, bucket: int) -> os.stat_result:
+    """os.stat yang di-cache per bucket waktu (lihat _file_exists)"""
+    return os.stat(path)
+
+def _file_exists(path: str) -> bool:
+    """Cek path adalah file biasa, hasil stat di-cache 5 detik (path video bisa di network share)"""
+    try:
+        return S_ISREG(_stat_cached(path, int(time.monotonic() // 5)).st_mode)
+    except OSError:
+        return False
+
+# Model yang mendukung structured output: response langsung JSON, tanpa ```json fence
+_JSON_RESPONSE_MODELS = frozenset({'gemini-2.0-flash-exp'})
+
+@functools.lru_cache(maxsize=1)
+def _sdk_supports_json_mode() -> bool:
+    """Cek GenerationConfig SDK punya response_mime_type (google-generativeai >= 0.5)"""
+    try:
+        fields = {field.name for field in dataclasses.fields(_load_genai().types.GenerationConfig)}
+    except (AttributeError, TypeError):
+        return False
+    return "response_mime_type" in fields
+
+@functools.lru_cache(maxsize=4)
+def _get_model(api_key: str, model_name: str):
+    """Configure genai dan buat GenerativeModel sekali per (API key, model)"""
+    _load_genai().configure(api_key=api_key)
+    # SDK lama (mis. 0.3.2) menolak field yang tidak dikenal saat request dibuat
+    if model_name in _JSON_RESPONSE_MODELS and _sdk_supports_json_mode():
+        return genai.GenerativeModel(model_name, generation_config={"response_mime_type": "application/json"})
+    return genai.GenerativeModel(model_name)
+
+@functools.lru_cache(maxsize=1)
+def _get_models(api_key: str) -> tuple:
+    """Buat (model, vision_model) sekali per API key"""
+    # Use Gemini 2.0-flash (Latest and Most Advanced Model)
+    try:
+        # 2.0-flash sudah multi-modal, satu handle untuk text dan vision
+        model = _get_model(api_key, 'gemini-2.0-flash-exp')
+        return model, model
+    except Exception:
+        # Fallback to gemini-pro if 2.0-flash not available
+        return _get_model(api_key, 'gemini-pro'), _get_model(api_key, 'gemini-pro-vision')
+
+def _frame_phash(jpeg: bytes) -> int:
+    """Perceptual hash 64-bit (DCT 32x32) dari frame JPEG"""
+    # Decode langsung ke grayscale 1/4 resolusi, cukup untuk hash 32x32
+    gray = cv2.imdecode(np.frombuffer(jpeg, dtype=np.uint8), cv2.IMREAD_REDUCED_GRAYSCALE_4)
+    if gray is None:
+        raise ValueError("Frame JPEG tidak bisa di-decode")
+    dct = cv2.dct(np.float32(cv2.resize(gray, (32, 32), interpolation=cv2.INTER_AREA)))[:8, :8]
+    return int.from_bytes(np.packbits(dct > np.median(dct)).tobytes(), "big")
+
+def _loads(text) -> Any:
+    """Parse JSON (str atau bytes), pakai orjson jika tersedia"""
+    if ORJSON_AVAILABLE:
+        return orjson.loads(text)
+    return json.loads(text)
+
+def _print_result(title: str, result: Any):
+    """Tulis judul + hasil JSON ke stdout dalam satu write"""
+    sys.stdout.write(f"\n{Fore.GREEN}{title}{Style.RESET_ALL}\n{_dumps_pretty(result)}\n")
+
+def _dumps(obj: Any, sort_keys: bool = False) -> str:
+    """Serialize ke JSON compact (tanpa spasi), pakai orjson jika tersedia"""
+    if ORJSON_AVAILABLE:
+        try:
+            return orjson.dumps(obj, option=orjson.OPT_SORT_KEYS if sort_keys else 0).decode()
+        except TypeError:
+            pass
+    return json.dumps(obj, ensure_ascii=False, sort_keys=sort_keys, separators=(",", ":"))
+
+def _dumps_pretty(obj: Any, sort_keys: bool = False) -> str:
+    """Serialize ke JSON dengan indent 2, pakai orjson jika tersedia"""
+    if ORJSON_AVAILABLE:
+        option = orjson.OPT_INDENT_2 | orjson.OPT_SORT_KEYS if sort_keys else orjson.OPT_INDENT_2
+        try:
+            return orjson.dumps(obj, option=option).decode()
+        except TypeError:
+            pass
+    return json.dumps(obj, indent=2, ensure_ascii=False, sort_keys=sort_keys)
+
+# Prompt templates, placeholder diisi dengan str.format_map saat dipanggil.
+# Bagian statis selalu di awal dan bagian per-request di akhir, supaya prefix yang sama
+# antar request bisa kena implicit context caching Gemini.
+_ANALYSIS_PROMPT_EN = """
+You are an advanced AI content strategist powered by Gemini 2.0-flash. Analyze these video frames to create viral-ready social media content.
+
+ADVANCED ANALYSIS REQUIREMENTS:
+1. Deep visual understanding of scenes, objects, people, emotions
+2. Context awareness and storytelling potential
+3. Viral trend prediction and engagement optimization
+4. Platform-specific content adaptation
+5. Audience psychology and behavior analysis
+
+Provide response in PERFECT JSON format with these enhanced keys:
+{
+  "visual_elements": {
+    "main_subjects": ["list of main subjects/people"],
+    "objects": ["detailed objects in scene"],
+    "setting": "detailed environment description",
+    "lighting": "lighting quality and mood",
+    "composition": "visual composition analysis"
+  },
+  "content_analysis": {
+    "activities": ["what's happening in detail"],
+    "emotions": ["emotions conveyed"],
+    "story_potential": "narrative potential score 1-10",
+    "engagement_hooks": ["specific engagement elements"]
+  },
+  "viral_potential": {
+    "viral_score": "score 1-10 with reasoning",
+    "trending_elements": ["elements that could trend"],
+    "shareability_factors": ["why people would share"],
+    "meme_potential": "meme creation potential 1-10"
+  },
+  "platform_optimization": {
+    "tiktok_potential": "optimization score 1-10",
+    "instagram_potential": "optimization score 1-10", 
+    "youtube_potential": "optimization score 1-10",
+    "facebook_potential": "optimization score 1-10"
+  },
+  "content_strategy": {
+    "target_audience": "detailed audience description",
+    "content_pillars": ["main content themes"],
+    "call_to_action_suggestions": ["specific CTAs"],
+    "hashtag_strategy": ["strategic hashtag categories"]
+  },
+  "technical_quality": {
+    "video_quality": "quality assessment",
+    "audio_potential": "estimated audio quality",
+    "editing_suggestions": ["improvement suggestions"]
+  }
+}
+"""
+
+_ANALYSIS_PROMPT_ID = """
+Anda adalah AI content strategist canggih yang didukung Gemini 2.0-flash. Analisis frame video ini untuk membuat konten media sosial yang viral.
+
+REQUIREMENTS ANALISIS LANJUTAN:
+1. Pemahaman visual mendalam tentang scene, objek, orang, emosi
+2. Kesadaran konteks dan potensi storytelling
+3. Prediksi trend viral dan optimasi engagement
+4. Adaptasi konten spesifik platform
+5. Analisis psikologi dan perilaku audience
+
+Berikan respons dalam format JSON SEMPURNA dengan keys yang ditingkatkan:
+{
+  "elemen_visual": {
+    "subjek_utama": ["daftar subjek/orang utama"],
+    "objek": ["objek detail dalam scene"],
+    "setting": "deskripsi environment detail",
+    "pencahayaan": "kualitas lighting dan mood",
+    "komposisi": "analisis komposisi visual"
+  },
+  "analisis_konten": {
+    "aktivitas": ["apa yang terjadi secara detail"],
+    "emosi": ["emosi yang disampaikan"],
+    "potensi_cerita": "skor potensi narasi 1-10",
+    "engagement_hooks": ["elemen engagement spesifik"]
+  },
+  "potensi_viral": {
+    "skor_viral": "skor 1-10 dengan alasan",
+    "elemen_trending": ["elemen yang bisa trending"],
+    "faktor_shareability": ["mengapa orang akan share"],
+    "potensi_meme": "potensi pembuatan meme 1-10"
+  },
+  "optimasi_platform": {
+    "potensi_tiktok": "skor optimasi 1-10",
+    "potensi_instagram": "skor optimasi 1-10",
+    "potensi_youtube": "skor optimasi 1-10", 
+    "potensi_facebook": "skor optimasi 1-10"
+  },
+  "strategi_konten": {
+    "target_audience": "deskripsi audience detail",
+    "pilar_konten": ["tema konten utama"],
+    "saran_call_to_action": ["CTA spesifik"],
+    "strategi_hashtag": ["kategori hashtag strategis"]
+  },
+  "kualitas_teknis": {
+    "kualitas_video": "penilaian kualitas",
+    "potensi_audio": "estimasi kualitas audio",
+    "saran_editing": ["saran perbaikan"]
+  }
+}
+"""
+
+_PLATFORM_PROMPT_EN = """
+You are a viral content creation expert powered by Gemini 2.0-flash. Create highly engaging, platform-optimized content based on the advanced video analysis at the end of this prompt.
+
+Platform-specific optimization:
+- TikTok: Viral hooks, trending sounds, youth slang, 15-60s optimization
+- Instagram: Aesthetic appeal, story-worthy, lifestyle integration
+- YouTube: SEO optimization, retention hooks, algorithm-friendly
+- Facebook: Community engagement, discussion starters, shareability
+
+GENERATE PERFECT JSON with these enhanced keys:
+{{
+  "title_variations": [
+    {{
+      "type": "viral_hook",
+      "title": "attention-grabbing viral title",
+      "hook_type": "curiosity/shock/emotion"
+    }},
+    {{
+      "type": "question_format", 
+      "title": "engaging question title",
+      "engagement_trigger": "specific trigger"
+    }},
+    {{
+      "type": "trending_format",
+      "title": "trending format title", 
+      "trend_element": "current trend used"
+    }}
+  ],
+  "description_options": [
+    {{
+      "type": "storytelling",
+      "content": "narrative-driven description",
+      "story_arc": "beginning-middle-end structure"
+    }},
+    {{
+      "type": "educational",
+      "content": "value-providing description",
+      "learning_outcome": "what viewers learn"
+    }},
+    {{
+      "type": "entertainment",
+      "content": "fun and engaging description",
+      "entertainment_value": "why it's entertaining"
+    }}
+  ],
+  "hashtag_strategy": {{
+    "trending_hashtags": ["current trending tags"],
+    "niche_hashtags": ["specific niche tags"],
+    "branded_hashtags": ["potential brand tags"],
+    "location_hashtags": ["location-based tags"],
+    "optimal_count": "recommended number for platform"
+  }},
+  "engagement_optimization": {{
+    "hook_timing": "when to place hook (seconds)",
+    "cta_placement": "optimal CTA placement",
+    "interaction_triggers": ["specific engagement triggers"],
+    "retention_tactics": ["keep viewers watching"]
+  }},
+  "viral_elements": {{
+    "trending_sounds": ["suggested trending audio"],
+    "visual_effects": ["recommended effects"],
+    "editing_style": "optimal editing approach",
+    "posting_strategy": "best time and frequency"
+  }}
+}}
+
+VIDEO ANALYSIS:
+{analysis_json}
+
+ADVANCED CONTENT GENERATION FOR {platform_upper} ({platform}).
+"""
+
+_PLATFORM_PROMPT_ID = """
+Anda adalah expert pembuatan konten viral yang didukung Gemini 2.0-flash. Buat konten yang sangat engaging dan dioptimasi berdasarkan analisis video lanjutan di akhir prompt ini.
+
+Optimasi spesifik platform:
+- TikTok: Hook viral, trending sounds, bahasa anak muda, optimasi 15-60s
+- Instagram: Daya tarik estetik, story-worthy, integrasi lifestyle
+- YouTube: Optimasi SEO, retention hooks, algorithm-friendly
+- Facebook: Community engagement, discussion starters, shareability
+
+GENERATE JSON SEMPURNA dengan keys yang ditingkatkan:
+{{
+  "variasi_judul": [
+    {{
+      "tipe": "viral_hook",
+      "judul": "judul viral yang menarik perhatian",
+      "tipe_hook": "curiosity/shock/emotion"
+    }},
+    {{
+      "tipe": "format_pertanyaan",
+      "judul": "judul pertanyaan yang engaging", 
+      "trigger_engagement": "trigger spesifik"
+    }},
+    {{
+      "tipe": "format_trending",
+      "judul": "judul format trending",
+      "elemen_trend": "trend terkini yang digunakan"
+    }}
+  ],
+  "opsi_deskripsi": [
+    {{
+      "tipe": "storytelling",
+      "konten": "deskripsi berbasis narasi",
+      "alur_cerita": "struktur awal-tengah-akhir"
+    }},
+    {{
+      "tipe": "edukatif",
+      "konten": "deskripsi yang memberikan value",
+      "hasil_pembelajaran": "apa yang dipelajari viewer"
+    }},
+    {{
+      "tipe": "hiburan",
+      "konten": "deskripsi fun dan engaging",
+      "nilai_hiburan": "mengapa menghibur"
+    }}
+  ],
+  "strategi_hashtag": {{
+    "hashtag_trending": ["tag trending saat ini"],
+    "hashtag_niche": ["tag niche spesifik"],
+    "hashtag_branded": ["potential brand tags"],
+    "hashtag_lokasi": ["tag berbasis lokasi"],
+    "jumlah_optimal": "jumlah yang direkomendasikan untuk platform"
+  }},
+  "optimasi_engagement": {{
+    "timing_hook": "kapan menempatkan hook (detik)",
+    "penempatan_cta": "penempatan CTA optimal",
+    "trigger_interaksi": ["trigger engagement spesifik"],
+    "taktik_retention": ["menjaga viewer tetap menonton"]
+  }},
+  "elemen_viral": {{
+    "trending_sounds": ["audio trending yang disarankan"],
+    "efek_visual": ["efek yang direkomendasikan"],
+    "gaya_editing": "pendekatan editing optimal",
+    "strategi_posting": "waktu dan frekuensi terbaik"
+  }}
+}}
+
+ANALISIS VIDEO:
+{analysis_json}
+
+GENERASI KONTEN LANJUTAN UNTUK {platform_upper} ({platform}).
+"""
+
+# Ditambahkan ke _PLATFORM_PROMPT_* supaya semua platform di-generate dalam satu request
+_MULTI_PLATFORM_SUFFIX_EN = """
+Generate the content above separately for EACH of these platforms: {platform_list}.
+Return ONE JSON object whose keys are exactly {platform_keys} and whose values each follow the JSON structure above.
+"""
+
+_MULTI_PLATFORM_SUFFIX_ID = """
+Generate konten di atas secara terpisah untuk SETIAP platform berikut: {platform_list}.
+Return SATU JSON object dengan keys persis {platform_keys} dan setiap value mengikuti struktur JSON di atas.
+"""
+
+_TEXT_POST_PROMPT_EN = """
+You are a viral content strategist powered by Gemini 2.0-flash. Create an engaging text post for {platform} about: {topic}
+
+ADVANCED TEXT POST GENERATION:
+
+Platform guidelines:
+- TikTok: Casual, trendy, youth-focused, hook-driven
+- Instagram: Aesthetic, lifestyle, visual storytelling
+- YouTube: Informative, searchable, community-building
+- Facebook: Conversational, community-focused, discussion-starter
+
+Generate PERFECT JSON with enhanced structure:
+{{
+  "content_variations": [
+    {{
+      "style": "viral_hook",
+      "content": "attention-grabbing content with hook",
+      "engagement_factor": "why it's engaging"
+    }},
+    {{
+      "style": "storytelling", 
+      "content": "narrative-driven content",
+      "story_element": "story component used"
+    }},
+    {{
+      "style": "educational",
+      "content": "value-providing content",
+      "value_proposition": "what value it provides"
+    }}
+  ],
+  "hashtag_strategy": {{
+    "primary_hashtags": ["main topic hashtags"],
+    "trending_hashtags": ["current trending hashtags"],
+    "engagement_hashtags": ["hashtags that drive engagement"]
+  }},
+  "call_to_action": {{
+    "primary_cta": "main call to action",
+    "secondary_cta": "backup call to action",
+    "engagement_type": "type of engagement expected"
+  }},
+  "optimization_tips": {{
+    "best_posting_time": "optimal posting time",
+    "engagement_tactics": ["specific tactics to boost engagement"],
+    "viral_potential": "viral potential score 1-10"
+  }}
+}}
+"""
+
+_TEXT_POST_PROMPT_ID = """
+Anda adalah viral content strategist yang didukung Gemini 2.0-flash. Buat text post yang engaging untuk {platform} tentang: {topic}
+
+GENERASI TEXT POST LANJUTAN:
+
+Panduan platform:
+- TikTok: Casual, trendy, youth-focused, hook-driven
+- Instagram: Aesthetic, lifestyle, visual storytelling
+- YouTube: Informatif, searchable, community-building
+- Facebook: Conversational, community-focused, discussion-starter
+
+Generate JSON SEMPURNA dengan struktur yang ditingkatkan:
+{{
+  "variasi_konten": [
+    {{
+      "gaya": "viral_hook",
+      "konten": "konten menarik perhatian dengan hook",
+      "faktor_engagement": "mengapa engaging"
+    }},
+    {{
+      "gaya": "storytelling",
+      "konten": "konten berbasis narasi", 
+      "elemen_cerita": "komponen cerita yang digunakan"
+    }},
+    {{
+      "gaya": "edukatif",
+      "konten": "konten yang memberikan value",
+      "proposisi_nilai": "value apa yang diberikan"
+    }}
+  ],
+  "strategi_hashtag": {{
+    "hashtag_utama": ["hashtag topik utama"],
+    "hashtag_trending": ["hashtag trending saat ini"],
+    "hashtag_engagement": ["hashtag yang mendorong engagement"]
+  }},
+  "call_to_action": {{
+    "cta_utama": "call to action utama",
+    "cta_sekunder": "call to action cadangan",
+    "tipe_engagement": "jenis engagement yang diharapkan"
+  }},
+  "tips_optimasi": {{
+    "waktu_posting_terbaik": "waktu posting optimal",
+    "taktik_engagement": ["taktik spesifik untuk boost engagement"],
+    "potensi_viral": "skor potensi viral 1-10"
+  }}
+}}
+"""
+
+# Berubah setiap kali isi prompt diubah, supaya hasil cache dari prompt lama tidak dipakai lagi
+_PROMPT_VERSION = hashlib.blake2b(
+    "".join((_ANALYSIS_PROMPT_EN, _ANALYSIS_PROMPT_ID, _PLATFORM_PROMPT_EN, _PLATFORM_PROMPT_ID,
+             _MULTI_PLATFORM_SUFFIX_EN, _MULTI_PLATFORM_SUFFIX_ID,
+             _TEXT_POST_PROMPT_EN, _TEXT_POST_PROMPT_ID)).encode(),
+    digest_size=8
+).hexdigest()
+
+# Template fallback statis, dibangun sekali saat import
+_FALLBACK_ANALYSIS_EN = MappingProxyType({
+    "visual_elements": {
+        "main_subjects": ["video content"],
+        "objects": ["various objects"],
+        "setting": "unknown environment",
+        "lighting": "standard lighting",
+        "composition": "standard composition"
+    },
+    "content_analysis": {
+        "activities": ["unknown activity"],
+        "emotions": ["neutral"],
+        "story_potential": 7,
+        "engagement_hooks": ["visual content", "interesting moments"]
+    },
+    "viral_potential": {
+        "viral_score": "7 - good potential with optimization",
+        "trending_elements": ["engaging visuals", "shareable content"],
+        "shareability_factors": ["interesting content", "good quality"],
+        "meme_potential": 6
+    },
+    "platform_optimization": {
+        "tiktok_potential": 8,
+        "instagram_potential": 7,
+        "youtube_potential": 7,
+        "facebook_potential": 6
+    },
+    "content_strategy": {
+        "target_audience": "general social media users",
+        "content_pillars": ["entertainment", "engagement"],
+        "call_to_action_suggestions": ["like and share", "comment below"],
+        "hashtag_strategy": ["trending", "viral", "content"]
+    },
+    "technical_quality": {
+        "video_quality": "good",
+        "audio_potential": "standard",
+        "editing_suggestions": ["add trending music", "optimize for mobile"]
+    }
+})
+
+_FALLBACK_ANALYSIS_ID = MappingProxyType({
+    "elemen_visual": {
+        "subjek_utama": ["konten video"],
+        "objek": ["berbagai objek"],
+        "setting": "lingkungan tidak diketahui",
+        "pencahayaan": "pencahayaan standar",
+        "komposisi": "komposisi standar"
+    },
+    "analisis_konten": {
+        "aktivitas": ["aktivitas tidak diketahui"],
+        "emosi": ["netral"],
+        "potensi_cerita": 7,
+        "engagement_hooks": ["konten visual", "momen menarik"]
+    },
+    "potensi_viral": {
+        "skor_viral": "7 - potensi bagus dengan optimasi",
+        "elemen_trending": ["visual menarik", "konten shareable"],
+        "faktor_shareability": ["konten menarik", "kualitas bagus"],
+        "potensi_meme": 6
+    },
+    "optimasi_platform": {
+        "potensi_tiktok": 8,
+        "potensi_instagram": 7,
+        "potensi_youtube": 7,
+        "potensi_facebook": 6
+    },
+    "strategi_konten": {
+        "target_audience": "pengguna media sosial umum",
+        "pilar_konten": ["hiburan", "engagement"],
+        "saran_call_to_action": ["like dan share", "komentar di bawah"],
+        "strategi_hashtag": ["trending", "viral", "konten"]
+    },
+    "kualitas_teknis": {
+        "kualitas_video": "bagus",
+        "potensi_audio": "standar",
+        "saran_editing": ["tambah musik trending", "optimasi untuk mobile"]
+    }
+})
+
+_FALLBACK_PLATFORM_CONTENT_EN = MappingProxyType({
+    "tiktok": {
+        "title_variations": [
+            {"type": "viral_hook", "title": "This Video Will Blow Your Mind! 🔥", "hook_type": "curiosity"},
+            {"type": "question_format", "title": "Why Is Everyone Talking About This?", "engagement_trigger": "curiosity"},
+            {"type": "trending_format", "title": "POV: You Discover This Amazing Thing", "trend_element": "POV format"}
+        ],
+        "description_options": [
+            {"type": "storytelling", "content": "Amazing content that will change your perspective! Tag someone who needs to see this.", "story_arc": "discovery-revelation-impact"},
+            {"type": "educational", "content": "Learn something new today with this incredible content!", "learning_outcome": "new knowledge"},
+            {"type": "entertainment", "content": "Pure entertainment that will make your day better!", "entertainment_value": "mood boost"}
+        ],
+        "hashtag_strategy": {
+            "trending_hashtags": ["#fyp", "#viral", "#trending"],
+            "niche_hashtags": ["#amazing", "#wow", "#mindblowing"],
+            "branded_hashtags": ["#tiktok", "#video"],
+            "location_hashtags": ["#worldwide"],
+            "optimal_count": "5-8 hashtags"
+        }
+    }
+})
+
+_FALLBACK_PLATFORM_CONTENT_ID = MappingProxyType({
+    "tiktok": {
+        "variasi_judul": [
+            {"tipe": "viral_hook", "judul": "Video Viral yang Bikin Jutaan Views! 🔥", "tipe_hook": "curiosity"},
+            {"tipe": "format_pertanyaan", "judul": "Kenapa Video Ini Bisa Trending #1?", "trigger_engagement": "curiosity"},
+            {"tipe": "format_trending", "judul": "POV: Kamu Nemuin Hal Amazing Ini", "elemen_trend": "POV format"}
+        ],
+        "opsi_deskripsi": [
+            {"tipe": "storytelling", "konten": "Konten amazing yang akan mengubah perspektif kamu! Tag bestie yang perlu lihat ini.", "alur_cerita": "penemuan-revelasi-dampak"},
+            {"tipe": "edukatif", "konten": "Belajar hal baru hari ini dengan konten incredible ini!", "hasil_pembelajaran": "pengetahuan baru"},
+            {"tipe": "hiburan", "konten": "Hiburan murni yang akan membuat hari kamu lebih baik!", "nilai_hiburan": "mood boost"}
+        ],
+        "strategi_hashtag": {
+            "hashtag_trending": ["#fyp", "#viral", "#trending"],
+            "hashtag_niche": ["#amazing", "#wow", "#keren"],
+            "hashtag_branded": ["#tiktok", "#video"],
+            "hashtag_lokasi": ["#indonesia"],
+            "jumlah_optimal": "5-8 hashtag"
+        }
+    }
+})
+
+# Versi JSON dari template fallback: _loads menghasilkan salinan baru yang utuh (deep)
+# setiap dipanggil, jadi caller bebas mengubah hasilnya tanpa merusak template
+def _frozen_json(mapping) -> bytes:
+    return json.dumps(dict(mapping), ensure_ascii=False).encode()
+
+_FALLBACK_ANALYSIS_JSON = {
+    "english": _frozen_json(_FALLBACK_ANALYSIS_EN),
+    "indonesian": _frozen_json(_FALLBACK_ANALYSIS_ID),
+}
+_FALLBACK_PLATFORM_CONTENT_JSON = {
+    "english": {platform: _frozen_json(value) for platform, value in _FALLBACK_PLATFORM_CONTENT_EN.items()},
+    "indonesian": {platform: _frozen_json(value) for platform, value in _FALLBACK_PLATFORM_CONTENT_ID.items()},
+}
+
+def _shorten_json_value(value: Any, max_chars: int, max_items: int) -> Any:
+    """Potong string panjang dan list panjang (rekursif) agar analysis muat di budget prompt"""
+    if isinstance(value, str):
+        return value if len(value) <= max_chars else value[:max_chars] + "…"
+    if isinstance(value, list):
+        return [_shorten_json_value(item, max_chars, max_items) for item in value[:max_items]]
+    if isinstance(value, dict):
+        return {key: _shorten_json_value(item, max_chars, max_items) for key, item in value.items()}
+    return value
+
+class AnalysisCache:
+    """Cache persistent (sqlite) untuk hasil analisis video, dengan TTL dan LRU eviction"""
+
+    def __init__(self, db_path: Path, ttl: float = 7 * 24 * 3600, max_entries: int = 256):
+        self.db_path = db_path
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self._lock = threading.Lock()
+        
+        self._conn = sqlite3.connect(str(db_path), check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS analysis ("
+            "key TEXT PRIMARY KEY, result TEXT NOT NULL, "
+            "cached_at REAL NOT NULL, last_access REAL NOT NULL, ttl REAL NOT NULL)"
+        )
+        # pHash frame per analysis, untuk lookup video near-duplicate (re-encode, trim kecil)
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS video_signature ("
+            "key TEXT PRIMARY KEY, namespace TEXT NOT NULL, signature TEXT NOT NULL)"
+        )
+        # Embedding (float32, sudah dinormalisasi) per text post, untuk lookup topik yang mirip
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS text_embedding ("
+            "key TEXT PRIMARY KEY, namespace TEXT NOT NULL, embedding BLOB NOT NULL)"
+        )
+        self._conn.commit()
+
+    @staticmethod
+    def make_key(video_path: str, language: str) -> str:
+        """Key dari 1MB pertama isi video + ukuran + mtime + language + versi prompt"""
+        stat = os.stat(video_path)
+        digest = hashlib.blake2b(digest_size=20)
+        with open(video_path, "rb") as f:
+            digest.update(f.read(1024 * 1024))
+        digest.update(f"{stat.st_size}:{stat.st_mtime_ns}:{language}:{_PROMPT_VERSION}".encode())
+        return digest.hexdigest()
+
+    @staticmethod
+    def make_content_key(analysis_json: str, platform: str, language: str) -> str:
+        """Key untuk content platform: analysis + platform + language + versi prompt"""
+        digest = hashlib.blake2b(analysis_json.encode(), digest_size=20)
+        digest.update(f"content:{platform}:{language}:{_PROMPT_VERSION}".encode())
+        return digest.hexdigest()
+
+    @staticmethod
+    def make_text_key(topic: str, platform: str, language: str) -> str:
+        """Key untuk text post: topic + platform + language + versi prompt"""
+        digest = hashlib.blake2b(digest_size=20)
+        digest.update(f"text:{topic.strip().lower()}:{platform.strip().lower()}:{language}:{_PROMPT_VERSION}".encode())
+        return digest.hexdigest()
+
+    @staticmethod
+    def make_embedding_namespace(platform: str, language: str) -> str:
+        """Namespace embedding text post: topik mirip hanya dicocokkan per platform + language"""
+        return f"text:{platform.strip().lower()}:{language}:{_PROMPT_VERSION}"
+
+    def get(self, key: str) -> Optional[Dict[str, Any]]:
+        """Ambil hasil dari cache, None jika tidak ada atau sudah expired"""
+        now = time.time()
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT result, cached_at, ttl FROM analysis WHERE key = ?", (key,)
+            ).fetchone()
+            if row is None:
+                return None
+            
+            result, cached_at, ttl = row
+            if now - cached_at > ttl:
+                self._conn.execute("DELETE FROM analysis WHERE key = ?", (key,))
+                self._conn.commit()
+                return None
+            
+            self._conn.execute("UPDATE analysis SET last_access = ? WHERE key = ?", (now, key))
+            self._conn.commit()
+        return _loads(result)
+
+    def put(self, key: str, value: Dict[str, Any], ttl: Optional[float] = None):
+        """Simpan hasil ke cache dan buang entry yang paling lama tidak dipakai"""
+        now = time.time()
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO analysis (key, result, cached_at, last_access, ttl) "
+                "VALUES (?, ?, ?, ?, ?)",
+                (key, _dumps(value), now, now, ttl or self.ttl)
+            )
+            self._conn.execute(
+                "DELETE FROM analysis WHERE key NOT IN "
+                "(SELECT key FROM analysis ORDER BY last_access DESC LIMIT ?)",
+                (self.max_entries,)
+            )
+            self._conn.commit()
+
+    def put_signature(self, key: str, namespace: str, signature: List[int]):
+        """Simpan pHash frame untuk entry analysis dengan key tersebut"""
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO video_signature (key, namespace, signature) VALUES (?, ?, ?)",
+                (key, namespace, ",".join(f"{h:016x}" for h in signature))
+            )
+            self._conn.execute("DELETE FROM video_signature WHERE key NOT IN (SELECT key FROM analysis)")
+            self._conn.commit()
+
+    def find_similar(self, namespace: str, signature: List[int],
+                     max_distance: float = SIMILAR_FRAME_MAX_DISTANCE) -> Optional[Dict[str, Any]]:
+        """Cari analysis dari video dengan pHash frame paling mirip, None jika tidak ada yang cukup dekat"""
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT s.key, s.signature FROM video_signature s JOIN analysis a ON a.key = s.key "
+                "WHERE s.namespace = ?", (namespace,)
+            ).fetchall()
+        
+        best_key, best_distance = None, None
+        for key, stored in rows:
+            stored_hashes = [int(h, 16) for h in stored.split(",")]
+            if len(stored_hashes) != len(signature):
+                continue
+            distance = sum(bin(a ^ b).count("1") for a, b in zip(stored_hashes, signature)) / len(signature)
+            if distance <= max_distance and (best_distance is None or distance < best_distance):
+                best_key, best_distance = key, distance
+        
+        return self.get(best_key) if best_key else None
+
+    @staticmethod
+    def _normalize(embedding: List[float]) -> array:
+        """Embedding sebagai array float32 dengan panjang 1, cosine similarity jadi dot product"""
+        norm = math.sqrt(sum(x * x for x in embedding)) or 1.0
+        return array("f", (x / norm for x in embedding))
+
+    def put_embedding(self, key: str, namespace: str, embedding: List[float]):
+        """Simpan embedding untuk entry dengan key tersebut"""
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO text_embedding (key, namespace, embedding) VALUES (?, ?, ?)",
+                (key, namespace, self._normalize(embedding).tobytes())
+            )
+            self._conn.execute("DELETE FROM text_embedding WHERE key NOT IN (SELECT key FROM analysis)")
+            self._conn.commit()
+
+    def find_semantic(self, namespace: str, embedding: List[float],
+                      min_similarity: float = SEMANTIC_CACHE_MIN_SIMILARITY) -> Optional[Dict[str, Any]]:
+        """Cari entry dengan embedding paling mirip (cosine), None jika tidak ada yang cukup dekat"""
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT e.key, e.embedding FROM text_embedding e JOIN analysis a ON a.key = e.key "
+                "WHERE e.namespace = ?", (namespace,)
+            ).fetchall()
+        
+        query = self._normalize(embedding)
+        best_key, best_similarity = None, min_similarity
+        for key, stored in rows:
+            stored_vector = array("f")
+            stored_vector.frombytes(stored)
+            if len(stored_vector) != len(query):
+                continue
+            similarity = sum(map(operator.mul, stored_vector, query))
+            if similarity >= best_similarity:
+                best_key, best_similarity = key, similarity
+        
+        return self.get(best_key) if best_key else None
+
+    def cleanup_expired(self) -> int:
+        """Hapus semua entry yang sudah expired, return jumlah yang dihapus"""
+        with self._lock:
+            cursor = self._conn.execute(
+                "DELETE FROM analysis WHERE ? - cached_at > ttl", (time.time(),)
+            )
+            self._conn.commit()
+        return cursor.rowcount
+
+class GeminiRateLimiter:
+    """Sliding-window rate limiter (RPM/TPM) dengan AIMD untuk panggilan Gemini"""
+
+    # Default kuota Google AI: 60 request/menit, 100K token/menit
+    def __init__(self, rpm: int = 60, tpm: int = 100_000, max_concurrency: int = 8):
+        self.max_rpm = rpm
+        self.rpm = float(rpm)
+        self.tpm = tpm
+        self.max_concurrency = max_concurrency
+        self._requests = deque()  # (timestamp, tokens) dalam window 60 detik
+        self._lock = threading.Lock()
+        self._last_adjust = time.monotonic()
+
+    def _reserve(self, tokens: int) -> float:
+        """Reservasi slot request; return 0 jika berhasil, selain itu detik yang harus ditunggu"""
+        with self._lock:
+            now = time.monotonic()
+            
+            # Additive increase: RPM pulih +1 per menit setelah kena 429
+            self.rpm = min(float(self.max_rpm), self.rpm + (now - self._last_adjust) / 60)
+            self._last_adjust = now
+            
+            while self._requests and now - self._requests[0][0] >= 60:
+                self._requests.popleft()
+            
+            used_tokens = sum(t for _, t in self._requests)
+            if not self._requests or (len(self._requests) < int(self.rpm) and used_tokens + tokens <= self.tpm):
+                self._requests.append((now, tokens))
+                return 0.0
+            
+            return max(60 - (now - self._requests[0][0]), 0.05)
+
+    def acquire(self, tokens: int = 0):
+        """Tunggu (blocking) sampai request boleh dikirim"""
+        while True:
+            wait = self._reserve(tokens)
+            if not wait:
+                return
+            time.sleep(wait)
+
+    async def acquire_async(self, tokens: int = 0):
+        """Versi async dari acquire, tidak memblok event loop"""
+        while True:
+            wait = self._reserve(tokens)
+            if not wait:
+                return
+            await asyncio.sleep(wait)
+
+    def on_rate_limited(self):
+        """Multiplicative decrease setelah response 429"""
+        with self._lock:
+            self.rpm = max(1.0, self.rpm * 0.5)
+            self._last_adjust = time.monotonic()
 
 class GeminiAIAssistant:
+    # (warna, icon) per level log
+    _LEVELS = {
+        "INFO": (Fore.CYAN, "ℹ️"),
+        "SUCCESS": (Fore.GREEN, "✅"),
+        "WARNING": (Fore.YELLOW, "⚠️"),
+        "ERROR": (Fore.RED, "❌"),
+        "DEBUG": (Fore.MAGENTA, "🔍"),
+        "AI": (Fore.LIGHTMAGENTA_EX, "🤖")
+    }
+
     def __init__(self, debug: bool = False):
         """
         Initialize Gemini AI Assistant with 2.0-flash
@@ -51,6 +1049,17 @@ class GeminiAIAssistant:
         self.debug = debug
         self.model = None
         self.vision_model = None
+        self._loop = None
+        self.rate_limiter = GeminiRateLimiter()
+        self._api_status_cache = None  # (monotonic timestamp, status dict)
+        self._menu_handlers = {
+            "1": self._menu_choice_1,
+            "2": self._menu_choice_2,
+            "3": self._menu_choice_3,
+            "4": self._menu_choice_4,
+            "5": self._menu_choice_5,
+            "6": self._menu_exit,
+        }
         
         # Setup paths
         self.base_dir = Path(__file__).parent
@@ -59,59 +1068,35 @@ class GeminiAIAssistant:
         self.ai_cache_dir = self.base_dir / "ai_cache"
         self.ai_cache_dir.mkdir(exist_ok=True)
         
-        # Load environment variables
-        self._load_env_file()
+        self.cache_mode = os.getenv('GEMINI_CACHE_MODE', 'enabled').strip().lower()
+        if self.cache_mode not in CACHE_MODES:
+            self._log(f"GEMINI_CACHE_MODE tidak dikenal: {self.cache_mode}, pakai 'enabled'", "WARNING")
+            self.cache_mode = "enabled"
+        
+        # Cache hasil analisis video (persistent antar run)
+        self.analysis_cache = None
+        if self.cache_mode != "disabled":
+            try:
+                self.analysis_cache = AnalysisCache(self.ai_cache_dir / "analysis.sqlite")
+            except sqlite3.Error as e:
+                self._log(f"Analysis cache tidak tersedia: {e}", "WARNING")
+        
+        # FFmpeg (optional) untuk batch frame extraction
+        self.ffmpeg_path = shutil.which("ffmpeg")
+        
+        # CUDA decode untuk PyAV, dimatikan otomatis kalau device tidak bisa dibuka
+        self._pyav_hwaccel_enabled = True
         
         # Initialize Gemini 2.0-flash
         self._initialize_gemini()
 
     def _log(self, message: str, level: str = "INFO"):
         """Enhanced logging dengan warna"""
-        colors = {
-            "INFO": Fore.CYAN,
-            "SUCCESS": Fore.GREEN,
-            "WARNING": Fore.YELLOW,
-            "ERROR": Fore.RED,
-            "DEBUG": Fore.MAGENTA,
-            "AI": Fore.LIGHTMAGENTA_EX
-        }
-        
         if level == "DEBUG" and not self.debug:
             return
-            
-        color = colors.get(level, Fore.WHITE)
-        icons = {
-            "INFO": "ℹ️",
-            "SUCCESS": "✅",
-            "WARNING": "⚠️",
-            "ERROR": "❌",
-            "DEBUG": "🔍",
-            "AI": "🤖"
-        }
         
-        icon = icons.get(level, "📝")
-        print(f"{color}{icon} {message}{Style.RESET_ALL}")
-
-    def _load_env_file(self):
-        """Load environment variables from .env file"""
-        env_file = self.base_dir / ".env"
-        
-        if env_file.exists():
-            try:
-                with open(env_file, 'r', encoding='utf-8') as f:
-                    for line in f:
-                        line = line.strip()
-                        if line and not line.startswith('#') and '=' in line:
-                            key, value = line.split('=', 1)
-                            key = key.strip()
-                            value = value.strip().strip('"').strip("'")
-                            os.environ[key] = value
-                
-                if self.debug:
-                    self._log("Environment variables loaded from .env file", "SUCCESS")
-            except Exception as e:
-                if self.debug:
-                    self._log(f"Error loading .env file: {e}", "WARNING")
+        color, icon = self._LEVELS.get(level, (Fore.WHITE, "📝"))
+        sys.stdout.write(f"{color}{icon} {message}{Style.RESET_ALL}\n")
 
     def _initialize_gemini(self):
         """Initialize Gemini 2.0-flash (Latest Model)"""
@@ -124,77 +1109,306 @@ class GeminiAIAssistant:
         api_key = os.getenv('GEMINI_API_KEY')
         if not api_key or api_key == "your_api_key_here":
             self._log("GEMINI_API_KEY tidak ditemukan atau masih placeholder", "WARNING")
-            self._log("Buat file .env dengan: GEMINI_API_KEY=your_actual_api_key", "INFO")
+            self._log(_API_KEY_HINT, "INFO")
             return False
         
         try:
-            genai.configure(api_key=api_key)
-            
-            # Use Gemini 2.0-flash (Latest and Most Advanced Model)
+            self.model, self.vision_model = _get_models(api_key)
+        except Exception as e:
+            self._log(f"Gagal inisialisasi Gemini: {e}", "ERROR")
+            return False
+        
+        # 2.0-flash memakai satu handle untuk text dan vision, fallback gemini-pro dua handle
+        if self.model is self.vision_model:
+            self._log("🚀 Gemini 2.0-flash berhasil diinisialisasi!", "SUCCESS")
+            self._log("🎯 Menggunakan model terbaru dan paling canggih", "AI")
+        else:
+            self._log("Gemini Pro berhasil diinisialisasi (fallback)", "SUCCESS")
+        return True
+
+    def _sample_frame_indices(self, total_frames: int, num_frames: int) -> List[int]:
+        """Hitung index frame unik yang tersebar merata di sepanjang video"""
+        if total_frames <= 0:
+            raise ValueError("Video tidak dapat dibaca atau kosong")
+        # Video pendek bisa menghasilkan index kembar; np.unique membuang duplikat
+        # agar semua backend (decord, PyAV, OpenCV, ffmpeg) mengembalikan frame yang sama
+        return np.unique(np.linspace(0, total_frames - 1, num_frames, dtype=np.int64)).tolist()
+
+    def _extract_frames_decord(self, video_path: str, num_frames: int) -> Iterator["np.ndarray"]:
+        """Ambil frames (RGB) dengan decord, batch decode untuk index yang sparse"""
+        # num_threads=1 paling cepat untuk video resolusi tinggi
+        reader = decord.VideoReader(video_path, num_threads=1)
+        frame_indices = self._sample_frame_indices(len(reader), num_frames)
+        batch = reader.get_batch(frame_indices).asnumpy()
+        yield from batch
+
+    def _open_pyav(self, video_path: str, hwaccel: bool):
+        """Buka video dengan PyAV, pakai CUDA decode jika diminta dan tersedia"""
+        if hwaccel:
             try:
-                self.model = genai.GenerativeModel('gemini-2.0-flash-exp')
-                self.vision_model = genai.GenerativeModel('gemini-2.0-flash-exp')
-                self._log("🚀 Gemini 2.0-flash berhasil diinisialisasi!", "SUCCESS")
-                self._log("🎯 Menggunakan model terbaru dan paling canggih", "AI")
-                return True
+                return av.open(video_path, hwaccel=_PYAV_HWACCEL)
             except Exception as e:
-                if self.debug:
-                    self._log(f"Gemini 2.0-flash error: {e}", "DEBUG")
+                self._log(f"PyAV CUDA decode tidak tersedia, pakai software decode: {e}", "DEBUG")
+                self._pyav_hwaccel_enabled = False
+        return av.open(video_path)
+
+    def _extract_frames_pyav(self, video_path: str, num_frames: int) -> Iterator["np.ndarray"]:
+        """Ambil frames (RGB) dengan PyAV; jika CUDA decode gagal di tengah jalan, ulang dengan software decode"""
+        hwaccel = self._pyav_hwaccel_enabled and _PYAV_HWACCEL is not None
+        yielded = 0
+        try:
+            for frame_rgb in self._decode_frames_pyav(video_path, num_frames, hwaccel):
+                yield frame_rgb
+                yielded += 1
+        except Exception as e:
+            if not hwaccel:
+                raise
+            self._log(f"PyAV CUDA decode gagal, ulang dengan software decode: {e}", "DEBUG")
+            self._pyav_hwaccel_enabled = False
+            # Index sampel deterministik: lewati frame yang sudah terkirim ke encoder
+            yield from itertools.islice(self._decode_frames_pyav(video_path, num_frames, False), yielded, None)
+
+    def _decode_frames_pyav(self, video_path: str, num_frames: int, hwaccel: bool) -> Iterator["np.ndarray"]:
+        """Decode frames (RGB) dengan PyAV, satu forward decode pass atau seek untuk video panjang"""
+        container = self._open_pyav(video_path, hwaccel)
+        try:
+            stream = container.streams.video[0]
+            stream.thread_type = "AUTO"
+            
+            total_frames = stream.frames
+            if not total_frames and stream.duration and stream.average_rate:
+                total_frames = int(stream.duration * stream.time_base * stream.average_rate)
+            
+            frame_indices = self._sample_frame_indices(total_frames, num_frames)
+            
+            # Sampel berjauhan: seek ke keyframe sebelum tiap target, decode sampai PTS target
+            if total_frames / len(frame_indices) > SEEK_MIN_GAP_FRAMES and stream.average_rate and stream.time_base:
+                start_pts = stream.start_time or 0
+                for frame_idx in frame_indices:
+                    target_pts = start_pts + int(frame_idx / stream.average_rate / stream.time_base)
+                    container.seek(target_pts, stream=stream)
+                    for frame in container.decode(stream):
+                        if frame.pts is None or frame.pts >= target_pts:
+                            yield frame.to_ndarray(format="rgb24")
+                            break
+                return
+            
+            target_set = set(frame_indices)
+            last_target = frame_indices[-1]
+            
+            for frame_idx, frame in enumerate(container.decode(stream)):
+                if frame_idx in target_set:
+                    yield frame.to_ndarray(format="rgb24")
+                if frame_idx >= last_target:
+                    break
+        finally:
+            container.close()
+
+    def _extract_frames_cv2(self, video_path: str, num_frames: int) -> Iterator["np.ndarray"]:
+        """Ambil frames (RGB) dengan OpenCV, grab() berurutan atau seek untuk video panjang"""
+        cap = cv2.VideoCapture(video_path)
+        try:
+            total_frames = int(cap.get(cv2.CAP_PROP_FRAME_COUNT))
+            frame_indices = self._sample_frame_indices(total_frames, num_frames)
+            
+            # BGR ke RGB sebagai view (tanpa copy), dibalik lagi saat encode JPEG
+            if total_frames / len(frame_indices) > SEEK_MIN_GAP_FRAMES:
+                # Sampel berjauhan: seek ke keyframe lebih murah dari grab semua frame di antaranya
+                for frame_idx in frame_indices:
+                    cap.set(cv2.CAP_PROP_POS_FRAMES, frame_idx)
+                    ret, frame = cap.read()
+                    
+                    if ret:
+                        yield frame[:, :, ::-1]
+                return
+            
+            # Satu forward pass: grab() tiap frame, retrieve() hanya di index target
+            position = 0
+            frame = None
+            for frame_idx in frame_indices:
+                while position <= frame_idx:
+                    if not cap.grab():
+                        return
+                    position += 1
+                    frame = None
                 
-                # Fallback to gemini-pro if 2.0-flash not available
+                if frame is None:
+                    ret, frame = cap.retrieve()
+                    if not ret:
+                        frame = None
+                        continue
+                yield frame[:, :, ::-1]
+        finally:
+            cap.release()
+
+    def _extract_frames_ffmpeg(self, video_path: str, num_frames: int, run_id: str) -> List[str]:
+        """Extract banyak frames sekaligus dengan satu proses ffmpeg (select filter)"""
+        cap = cv2.VideoCapture(video_path)
+        try:
+            total_frames = int(cap.get(cv2.CAP_PROP_FRAME_COUNT))
+        finally:
+            cap.release()
+        
+        frame_indices = self._sample_frame_indices(total_frames, num_frames)
+        select_expr = "+".join(f"eq(n,{idx})" for idx in frame_indices)
+        # Sisi terpanjang maksimal FRAME_MAX_EDGE, sama seperti _encode_frame
+        scale_expr = (
+            f"scale='if(gte(iw,ih),min({FRAME_MAX_EDGE},iw),-2)'"
+            f":'if(gte(iw,ih),-2,min({FRAME_MAX_EDGE},ih))'"
+        )
+        # Tulis ke file .tmp dulu lalu rename, agar tidak ada JPEG setengah jadi
+        output_pattern = self.temp_dir / f"frame_%03d_{run_id}.jpg.tmp"
+        
+        cmd = [
+            self.ffmpeg_path, '-v', 'error', '-y', '-i', video_path,
+            '-vf', f"select='{select_expr}',setpts=N/TB,{scale_expr}",
+            '-vsync', '0', '-f', 'image2', '-c:v', 'mjpeg', '-q:v', '3', str(output_pattern)
+        ]
+        
+        if self.debug:
+            self._log(f"FFmpeg command: {' '.join(cmd)}", "DEBUG")
+        
+        tmp_paths = [self.temp_dir / f"frame_{i:03d}_{run_id}.jpg.tmp" for i in range(1, len(frame_indices) + 1)]
+        try:
+            result = subprocess.run(cmd, capture_output=True, text=True)
+            if result.returncode != 0:
+                raise RuntimeError(result.stderr.strip() or "ffmpeg gagal extract frames")
+            
+            frame_paths = []
+            for tmp_path in tmp_paths:
+                if tmp_path.exists():
+                    frame_path = tmp_path.with_suffix("")
+                    os.replace(tmp_path, frame_path)
+                    frame_paths.append(str(frame_path))
+            return frame_paths
+        finally:
+            # Gagal, rename error atau Ctrl-C: jangan tinggalkan file .tmp di temp_dir
+            for tmp_path in tmp_paths:
+                tmp_path.unlink(missing_ok=True)
+
+    def _save_frame(self, frame_rgb: "np.ndarray", frame_path: Path):
+        """Tulis frame RGB sebagai JPEG secara atomic (tmp file lalu rename)"""
+        tmp_path = frame_path.with_suffix(".tmp")
+        try:
+            tmp_path.write_bytes(self._encode_frame(frame_rgb))
+            os.replace(tmp_path, frame_path)
+        except BaseException:
+            tmp_path.unlink(missing_ok=True)
+            raise
+
+    @staticmethod
+    def _encode_frame(frame_rgb: "np.ndarray") -> bytes:
+        """Encode frame RGB ke JPEG bytes dengan encoder OpenCV (libjpeg-turbo), maksimal FRAME_MAX_EDGE px"""
+        # OpenCV butuh BGR: balik channel lewat view, tanpa cvtColor atau objek PIL
+        frame_bgr = frame_rgb[:, :, ::-1]
+        
+        # Downscale 1080p+ sebelum encode: JPEG lebih kecil, token vision Gemini lebih sedikit
+        height, width = frame_bgr.shape[:2]
+        scale = FRAME_MAX_EDGE / max(height, width)
+        if scale < 1:
+            frame_bgr = cv2.resize(frame_bgr, (round(width * scale), round(height * scale)),
+                                   interpolation=cv2.INTER_AREA)
+        
+        ok, buffer = cv2.imencode(".jpg", frame_bgr,
+                                  [int(cv2.IMWRITE_JPEG_QUALITY), 85, int(cv2.IMWRITE_JPEG_OPTIMIZE), 1])
+        if not ok:
+            raise ValueError("Gagal encode frame ke JPEG")
+        return buffer.tobytes()
+
+    def _decode_and_encode_frames(self, video_path: str, num_frames: int, encode) -> List[Any]:
+        """Decode frames dengan backend tercepat, encode(index, frame_rgb) di worker thread"""
+        # Pilih backend decode tercepat yang tersedia, OpenCV sebagai fallback
+        backends = []
+        if DECORD_AVAILABLE:
+            backends.append(("decord", self._extract_frames_decord))
+        if AV_AVAILABLE:
+            backends.append(("pyav", self._extract_frames_pyav))
+        backends.append(("opencv", self._extract_frames_cv2))
+        
+        # Encode jalan di worker thread, overlap dengan decode frame berikutnya. imencode melepas GIL,
+        # jadi worker diskalakan ke jumlah core (decord decode semua frame sekaligus, encode jadi bottleneck)
+        max_workers = max(1, min(num_frames, max(2, min(8, os.cpu_count() or 1))))
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            futures = []
+            for name, backend in backends:
                 try:
-                    self.model = genai.GenerativeModel('gemini-pro')
-                    self.vision_model = genai.GenerativeModel('gemini-pro-vision')
-                    self._log("Gemini Pro berhasil diinisialisasi (fallback)", "SUCCESS")
-                    return True
-                except Exception as e2:
-                    self._log(f"Gagal inisialisasi Gemini: {e2}", "ERROR")
-                    return False
-                    
+                    for frame_rgb in backend(video_path, num_frames):
+                        futures.append(executor.submit(encode, len(futures), frame_rgb))
+                except Exception as e:
+                    if not futures:
+                        # Belum ada frame sama sekali: coba backend berikutnya
+                        self._log(f"Backend {name} gagal: {e}", "DEBUG")
+                        continue
+                    # Frame parsial tetap dipakai (decode ulang dari awal dengan backend lain lebih mahal)
+                    self._log(f"Backend {name} berhenti di tengah video, hanya {len(futures)} "
+                              f"dari {num_frames} frame yang dipakai: {e}", "WARNING")
+                
+                if futures:
+                    self._log(f"Frames di-decode dengan backend {name}", "DEBUG")
+                    break
+            
+            return [future.result() for future in futures]
+
+    def extract_video_frame_bytes(self, video_path: str, num_frames: int = 3) -> List[bytes]:
+        """Extract frames sebagai JPEG bytes di memory, tanpa menulis ke temp_dir"""
+        if not CV2_AVAILABLE or not _load_video_libs():
+            self._log("OpenCV tidak tersedia untuk video analysis", "WARNING")
+            return []
+        
+        if not _file_exists(video_path):
+            raise FileNotFoundError(f"Video tidak ditemukan: {video_path}")
+        
+        self._log(f"🎬 Extracting {num_frames} frames untuk Gemini 2.0-flash...", "AI")
+        
+        try:
+            frames = self._decode_and_encode_frames(
+                video_path, num_frames, lambda index, frame_rgb: self._encode_frame(frame_rgb)
+            )
+            if not frames:
+                raise ValueError("Video tidak dapat dibaca atau kosong")
+            
+            self._log(f"✅ Berhasil extract {len(frames)} frames", "SUCCESS")
+            return frames
+            
         except Exception as e:
-            self._log(f"Gagal konfigurasi Gemini AI: {e}", "ERROR")
-            return False
+            self._log(f"Error extracting frames: {e}", "ERROR")
+            return []
 
     def extract_video_frames(self, video_path: str, num_frames: int = 3) -> List[str]:
         """Extract frames dari video untuk analisis dengan Gemini 2.0-flash"""
-        if not CV2_AVAILABLE:
+        if not CV2_AVAILABLE or not _load_video_libs():
             self._log("OpenCV tidak tersedia untuk video analysis", "WARNING")
             return []
         
-        if not os.path.exists(video_path):
+        if not _file_exists(video_path):
             raise FileNotFoundError(f"Video tidak ditemukan: {video_path}")
         
         self._log(f"🎬 Extracting {num_frames} frames untuk Gemini 2.0-flash...", "AI")
         
         try:
-            cap = cv2.VideoCapture(video_path)
-            total_frames = int(cap.get(cv2.CAP_PROP_FRAME_COUNT))
+            # Nama unik per panggilan, aman untuk beberapa ekstraksi di detik yang sama
+            run_id = uuid.uuid4().hex[:8]
             
-            if total_frames == 0:
-                raise ValueError("Video tidak dapat dibaca atau kosong")
+            # Banyak frames: satu demux pass dengan ffmpeg jika tersedia
+            if num_frames >= FFMPEG_BATCH_MIN_FRAMES and self.ffmpeg_path:
+                try:
+                    extracted_frames = self._extract_frames_ffmpeg(video_path, num_frames, run_id)
+                    if extracted_frames:
+                        self._log(f"✅ Berhasil extract {len(extracted_frames)} frames (ffmpeg)", "SUCCESS")
+                        return extracted_frames
+                except Exception as e:
+                    self._log(f"FFmpeg batch extraction gagal: {e}", "DEBUG")
             
-            # Calculate frame intervals
-            frame_indices = np.linspace(0, total_frames - 1, num_frames, dtype=int)
+            def save(index: int, frame_rgb: "np.ndarray") -> str:
+                # Save frame as image
+                frame_path = self.temp_dir / f"frame_{index+1}_{run_id}.jpg"
+                self._save_frame(frame_rgb, frame_path)
+                return str(frame_path)
             
-            extracted_frames = []
+            extracted_frames = self._decode_and_encode_frames(video_path, num_frames, save)
             
-            for i, frame_idx in enumerate(frame_indices):
-                cap.set(cv2.CAP_PROP_POS_FRAMES, frame_idx)
-                ret, frame = cap.read()
-                
-                if ret:
-                    # Save frame as image
-                    frame_filename = f"frame_{i+1}_{int(time.time())}.jpg"
-                    frame_path = self.temp_dir / frame_filename
-                    
-                    # Convert BGR to RGB
-                    frame_rgb = cv2.cvtColor(frame, cv2.COLOR_BGR2RGB)
-                    image = Image.fromarray(frame_rgb)
-                    image.save(frame_path, quality=85)
-                    
-                    extracted_frames.append(str(frame_path))
-                    
-            cap.release()
+            if not extracted_frames:
+                raise ValueError("Video tidak dapat dibaca atau kosong")
             
             self._log(f"✅ Berhasil extract {len(extracted_frames)} frames", "SUCCESS")
             return extracted_frames
@@ -203,8 +1417,182 @@ class GeminiAIAssistant:
             self._log(f"Error extracting frames: {e}", "ERROR")
             return []
 
-    def analyze_video_content(self, video_path: str, language: str = "indonesian") -> Dict[str, Any]:
+    @staticmethod
+    def _estimate_tokens(contents) -> int:
+        """Estimasi kasar jumlah token: ~4 karakter per token, ~258 token per gambar"""
+        if isinstance(contents, str):
+            return len(contents) // 4
+        return sum(len(part) // 4 if isinstance(part, str) else 258 for part in contents)
+
+    def _note_api_error(self, error: Exception):
+        """Turunkan rate limit jika Gemini membalas 429"""
+        if getattr(error, "code", None) == 429:
+            self._log("Gemini rate limit (429), menurunkan request rate", "WARNING")
+            self.rate_limiter.on_rate_limited()
+
+    def _check_replay_mode(self):
+        """Di mode replay cache miss tidak boleh memanggil API; caller jatuh ke fallback"""
+        if self.cache_mode == "replay":
+            raise RuntimeError("GEMINI_CACHE_MODE=replay: tidak ada di cache, API tidak dipanggil")
+
+    @staticmethod
+    def _server_retry_delay(error: Exception) -> Optional[float]:
+        """Delay (detik) yang diminta server lewat RetryInfo, None jika tidak ada"""
+        for detail in getattr(error, "details", None) or ():
+            retry_delay = getattr(detail, "retry_delay", None)
+            if retry_delay is not None:
+                return retry_delay.seconds + retry_delay.nanos / 1e9
+        match = _RETRY_DELAY_RE.search(str(error))
+        return float(match.group(1)) if match else None
+
+    def _retry_delay(self, error: Exception, attempt: int, waited: float, max_wait: float,
+                     initial: float = 1.0, factor: float = 2.0, max_attempts: int = 4) -> Optional[float]:
+        """Delay sebelum retry berikutnya, None jika harus menyerah (attempt/budget habis, kuota harian)"""
+        if attempt >= max_attempts - 1:
+            return None
+        # Kuota harian habis bukan error sementara, retry hanya membuang waktu
+        if "PerDay" in str(error) or "per day" in str(error).lower():
+            return None
+        
+        delay = self._server_retry_delay(error)
+        if delay is None:
+            delay = initial * factor ** attempt
+            delay += random.uniform(0, delay * 0.1)
+        if waited + delay > max_wait:
+            return None
+        
+        self._log(f"Gemini sibuk ({type(error).__name__}), retry dalam {delay:.1f}s...", "WARNING")
+        return delay
+
+    def _retry(self, fn, *, max_wait: float = RETRY_MAX_WAIT):
+        """Jalankan fn dengan exponential backoff untuk error 429/503, total tunggu maksimal max_wait"""
+        waited = 0.0
+        for attempt in itertools.count():
+            try:
+                return fn()
+            except RETRYABLE_ERRORS as e:
+                delay = self._retry_delay(e, attempt, waited, max_wait)
+                if delay is None:
+                    raise
+                time.sleep(delay)
+                waited += delay
+
+    async def _retry_async(self, fn, *, max_wait: float = RETRY_MAX_WAIT):
+        """Versi async dari _retry dengan policy yang sama"""
+        waited = 0.0
+        for attempt in itertools.count():
+            try:
+                return await fn()
+            except RETRYABLE_ERRORS as e:
+                delay = self._retry_delay(e, attempt, waited, max_wait)
+                if delay is None:
+                    raise
+                await asyncio.sleep(delay)
+                waited += delay
+
+    def _generate(self, model, contents, on_chunk=None, max_wait: float = RETRY_MAX_WAIT):
+        """model.generate_content dengan rate limiting dan retry; on_chunk menerima teks streaming"""
+        self._check_replay_mode()
+        
+        # Hanya attempt pertama yang streaming: retry setelah 429/503 di tengah stream akan
+        # mencetak ulang preview dari awal, jadi retry memakai request biasa
+        state = {"attempts": 0, "previewed": False}
+        
+        def call():
+            self.rate_limiter.acquire(self._estimate_tokens(contents))
+            state["attempts"] += 1
+            try:
+                if on_chunk is None or state["attempts"] > 1:
+                    if state["previewed"]:
+                        self._log("Preview streaming terputus, request diulang tanpa preview", "INFO")
+                        state["previewed"] = False
+                    return model.generate_content(contents)
+                
+                response = model.generate_content(contents, stream=True)
+                for chunk in response:
+                    state["previewed"] = True
+                    on_chunk(chunk.text)
+                return response
+            except Exception as e:
+                self._note_api_error(e)
+                raise
+        
+        return self._retry(call, max_wait=max_wait)
+
+    @staticmethod
+    def _stream_preview():
+        """Buat callback on_chunk yang menampilkan field penting begitu string JSON-nya lengkap"""
+        state = {"buffer": ""}
+        
+        def on_chunk(text: str):
+            buffer = state["buffer"] + text
+            pos = 0
+            for match in _STREAM_PREVIEW_RE.finditer(buffer):
+                # Preview tidak boleh menggagalkan request: escape yang tidak valid atau tidak bisa
+                # ditulis ke terminal (mis. surrogate) ditampilkan apa adanya
+                try:
+                    value = json.loads(f'"{match.group(2)}"')
+                    print(f"{Style.DIM}  • {match.group(1)}: {value}{Style.RESET_ALL}", flush=True)
+                except ValueError:
+                    print(f"{Style.DIM}  • {match.group(1)}: {match.group(2)}{Style.RESET_ALL}", flush=True)
+                pos = match.end()
+            # Simpan hanya sisa yang belum match (maksimal _STREAM_PREVIEW_MAX_TAIL karakter),
+            # agar buffer tidak tumbuh sepanjang response yang tidak punya field preview
+            state["buffer"] = buffer[max(pos, len(buffer) - _STREAM_PREVIEW_MAX_TAIL):]
+        
+        return on_chunk
+
+    async def _generate_async(self, model, contents):
+        """model.generate_content_async dengan rate limiting dan retry yang sama dengan _generate"""
+        self._check_replay_mode()
+        
+        async def call():
+            await self.rate_limiter.acquire_async(self._estimate_tokens(contents))
+            try:
+                return await model.generate_content_async(contents)
+            except Exception as e:
+                self._note_api_error(e)
+                raise
+        
+        return await self._retry_async(call)
+
+    @staticmethod
+    def _parse_gemini_json(response_text: str) -> Any:
+        """Parse JSON pertama di response Gemini (JSON mode, atau ```json fence dari gemini-pro)"""
+        start = response_text.find("{")
+        if start == -1:
+            return _loads(response_text)
+        
+        # Kasus umum: satu object (dalam fence atau tidak), parse langsung dengan orjson
+        end = response_text.rfind("}") + 1
+        try:
+            return _loads(response_text[start:end])
+        except json.JSONDecodeError:
+            pass
+        
+        # raw_decode berhenti di akhir object pertama, teks sesudahnya diabaikan
+        return _JSON_DECODER.raw_decode(response_text, start)[0]
+
+    def analyze_video_content(self, video_path: str, language: str = "indonesian",
+                              on_chunk=None) -> Dict[str, Any]:
         """Analyze video content menggunakan Gemini 2.0-flash dengan advanced capabilities"""
+        # Video + language yang sama sudah pernah dianalisis: pakai hasil cache
+        cache_key = None
+        if self.analysis_cache:
+            try:
+                cache_key = AnalysisCache.make_key(video_path, language)
+                cached = self.analysis_cache.get(cache_key)
+                if cached is not None:
+                    self._log("🎯 Video analysis diambil dari cache", "SUCCESS")
+                    return cached
+            except (OSError, sqlite3.Error, ValueError) as e:
+                self._log(f"Analysis cache dilewati: {e}", "DEBUG")
+        
+        # Mode replay: cache miss sudah pasti tidak memanggil API, jangan buang waktu decode frames
+        if self.cache_mode == "replay":
+            self._log("GEMINI_CACHE_MODE=replay: video tidak ada di cache, pakai fallback analysis", "WARNING")
+            return self._generate_enhanced_fallback_analysis(video_path, language)
+        
         if not self.vision_model:
             self._log("Gemini AI tidak tersedia", "ERROR")
             return self._generate_fallback_analysis(video_path, language)
@@ -213,137 +1601,53 @@ class GeminiAIAssistant:
             # Extract frames jika CV2 tersedia
             frames = []
             if CV2_AVAILABLE:
-                frames = self.extract_video_frames(video_path, num_frames=5)  # More frames for 2.0-flash
+                # Frames langsung sebagai JPEG bytes di memory, tidak lewat temp_dir
+                frames = self.extract_video_frame_bytes(video_path, num_frames=ANALYSIS_NUM_FRAMES)
             
             if not frames:
                 # Jika tidak bisa extract frames, gunakan fallback analysis
                 self._log("Tidak bisa extract frames, menggunakan fallback analysis", "WARNING")
                 return self._generate_fallback_analysis(video_path, language)
             
+            # Video near-duplicate (re-encode, trim kecil) yang sudah pernah dianalisis
+            signature = None
+            signature_namespace = f"{language}:{_PROMPT_VERSION}:{ANALYSIS_NUM_FRAMES}"
+            if self.analysis_cache:
+                try:
+                    signature = [_frame_phash(frame) for frame in frames]
+                    similar = self.analysis_cache.find_similar(signature_namespace, signature)
+                    if similar is not None:
+                        self._log("🎯 Video analysis diambil dari cache (video mirip)", "SUCCESS")
+                        if cache_key:
+                            self.analysis_cache.put(cache_key, similar)
+                            self.analysis_cache.put_signature(cache_key, signature_namespace, signature)
+                        return similar
+                except (ValueError, sqlite3.Error) as e:
+                    self._log(f"Similarity cache dilewati: {e}", "DEBUG")
+            
             self._log(f"🚀 Menganalisis konten video dengan Gemini 2.0-flash...", "AI")
             
             # Analyze multiple frames for better understanding
-            images = [Image.open(frame) for frame in frames[:3]]  # Use first 3 frames
+            # Kirim JPEG bytes langsung, tanpa decode ke PIL lalu encode ulang di SDK
+            images = [{"mime_type": "image/jpeg", "data": frame} for frame in frames]
             
             # Enhanced prompt untuk Gemini 2.0-flash dengan advanced capabilities
-            if language == "english":
-                prompt = """
-                You are an advanced AI content strategist powered by Gemini 2.0-flash. Analyze these video frames to create viral-ready social media content.
-
-                ADVANCED ANALYSIS REQUIREMENTS:
-                1. Deep visual understanding of scenes, objects, people, emotions
-                2. Context awareness and storytelling potential
-                3. Viral trend prediction and engagement optimization
-                4. Platform-specific content adaptation
-                5. Audience psychology and behavior analysis
-
-                Provide response in PERFECT JSON format with these enhanced keys:
-                {
-                  "visual_elements": {
-                    "main_subjects": ["list of main subjects/people"],
-                    "objects": ["detailed objects in scene"],
-                    "setting": "detailed environment description",
-                    "lighting": "lighting quality and mood",
-                    "composition": "visual composition analysis"
-                  },
-                  "content_analysis": {
-                    "activities": ["what's happening in detail"],
-                    "emotions": ["emotions conveyed"],
-                    "story_potential": "narrative potential score 1-10",
-                    "engagement_hooks": ["specific engagement elements"]
-                  },
-                  "viral_potential": {
-                    "viral_score": "score 1-10 with reasoning",
-                    "trending_elements": ["elements that could trend"],
-                    "shareability_factors": ["why people would share"],
-                    "meme_potential": "meme creation potential 1-10"
-                  },
-                  "platform_optimization": {
-                    "tiktok_potential": "optimization score 1-10",
-                    "instagram_potential": "optimization score 1-10", 
-                    "youtube_potential": "optimization score 1-10",
-                    "facebook_potential": "optimization score 1-10"
-                  },
-                  "content_strategy": {
-                    "target_audience": "detailed audience description",
-                    "content_pillars": ["main content themes"],
-                    "call_to_action_suggestions": ["specific CTAs"],
-                    "hashtag_strategy": ["strategic hashtag categories"]
-                  },
-                  "technical_quality": {
-                    "video_quality": "quality assessment",
-                    "audio_potential": "estimated audio quality",
-                    "editing_suggestions": ["improvement suggestions"]
-                  }
-                }
-                """
-            else:
-                prompt = """
-                Anda adalah AI content strategist canggih yang didukung Gemini 2.0-flash. Analisis frame video ini untuk membuat konten media sosial yang viral.
-
-                REQUIREMENTS ANALISIS LANJUTAN:
-                1. Pemahaman visual mendalam tentang scene, objek, orang, emosi
-                2. Kesadaran konteks dan potensi storytelling
-                3. Prediksi trend viral dan optimasi engagement
-                4. Adaptasi konten spesifik platform
-                5. Analisis psikologi dan perilaku audience
-
-                Berikan respons dalam format JSON SEMPURNA dengan keys yang ditingkatkan:
-                {
-                  "elemen_visual": {
-                    "subjek_utama": ["daftar subjek/orang utama"],
-                    "objek": ["objek detail dalam scene"],
-                    "setting": "deskripsi environment detail",
-                    "pencahayaan": "kualitas lighting dan mood",
-                    "komposisi": "analisis komposisi visual"
-                  },
-                  "analisis_konten": {
-                    "aktivitas": ["apa yang terjadi secara detail"],
-                    "emosi": ["emosi yang disampaikan"],
-                    "potensi_cerita": "skor potensi narasi 1-10",
-                    "engagement_hooks": ["elemen engagement spesifik"]
-                  },
-                  "potensi_viral": {
-                    "skor_viral": "skor 1-10 dengan alasan",
-                    "elemen_trending": ["elemen yang bisa trending"],
-                    "faktor_shareability": ["mengapa orang akan share"],
-                    "potensi_meme": "potensi pembuatan meme 1-10"
-                  },
-                  "optimasi_platform": {
-                    "potensi_tiktok": "skor optimasi 1-10",
-                    "potensi_instagram": "skor optimasi 1-10",
-                    "potensi_youtube": "skor optimasi 1-10", 
-                    "potensi_facebook": "skor optimasi 1-10"
-                  },
-                  "strategi_konten": {
-                    "target_audience": "deskripsi audience detail",
-                    "pilar_konten": ["tema konten utama"],
-                    "saran_call_to_action": ["CTA spesifik"],
-                    "strategi_hashtag": ["kategori hashtag strategis"]
-                  },
-                  "kualitas_teknis": {
-                    "kualitas_video": "penilaian kualitas",
-                    "potensi_audio": "estimasi kualitas audio",
-                    "saran_editing": ["saran perbaikan"]
-                  }
-                }
-                """
+            prompt = _ANALYSIS_PROMPT_EN if language == "english" else _ANALYSIS_PROMPT_ID
             
             # Use Gemini 2.0-flash advanced multi-modal capabilities
-            response = self.vision_model.generate_content([prompt] + images)
+            response = self._generate(self.vision_model, [prompt] + images, on_chunk)
             
             # Parse response
             try:
-                # Extract JSON from response
-                response_text = response.text
-                if "```json" in response_text:
-                    json_start = response_text.find("```json") + 7
-                    json_end = response_text.find("```", json_start)
-                    json_text = response_text[json_start:json_end].strip()
-                else:
-                    json_text = response_text
+                analysis = self._parse_gemini_json(response.text)
                 
-                analysis = json.loads(json_text)
+                if cache_key:
+                    try:
+                        self.analysis_cache.put(cache_key, analysis)
+                        if signature:
+                            self.analysis_cache.put_signature(cache_key, signature_namespace, signature)
+                    except sqlite3.Error as e:
+                        self._log(f"Gagal simpan analysis cache: {e}", "DEBUG")
                 
                 self._log(f"🎯 Advanced video analysis dengan Gemini 2.0-flash selesai", "SUCCESS")
                 return analysis
@@ -356,261 +1660,257 @@ class GeminiAIAssistant:
             self._log(f"Error analyzing video: {e}", "ERROR")
             return self._generate_enhanced_fallback_analysis(video_path, language)
 
+    def _generate_fallback_analysis(self, video_path: str, language: str = "indonesian") -> Dict[str, Any]:
+        """Generate fallback analysis saat Gemini atau frame extraction tidak tersedia"""
+        return self._generate_enhanced_fallback_analysis(video_path, language)
+
     def _generate_enhanced_fallback_analysis(self, video_path: str, language: str = "indonesian") -> Dict[str, Any]:
         """Generate enhanced fallback analysis untuk Gemini 2.0-flash"""
+        return _loads(_FALLBACK_ANALYSIS_JSON["english" if language == "english" else "indonesian"])
+
+    def _run_async(self, coro, sync_fallback):
+        """Jalankan coroutine di event loop milik assistant (dipakai ulang antar panggilan)"""
+        # Dipanggil dari dalam event loop yang sedang jalan (mis. Jupyter, handler async):
+        # run_until_complete akan RuntimeError, jadi pakai jalur sync yang sequential
+        try:
+            asyncio.get_running_loop()
+        except RuntimeError:
+            pass
+        else:
+            coro.close()
+            self._log("Event loop sedang berjalan, request dijalankan sequential (sync)", "DEBUG")
+            return sync_fallback()
+        
+        # Async client genai terikat ke loop tempat dia dibuat, jadi loop tidak dibuat ulang
+        if self._loop is None or self._loop.is_closed():
+            self._loop = asyncio.new_event_loop()
+        try:
+            return self._loop.run_until_complete(coro)
+        except BaseException:
+            # Ctrl-C atau error di tengah gather: batalkan request yang masih jalan
+            self._cancel_pending_tasks()
+            raise
+
+    def _cancel_pending_tasks(self):
+        """Cancel task yang tersisa di loop assistant dan tunggu sampai selesai"""
+        tasks = [task for task in asyncio.all_tasks(self._loop) if not task.done()]
+        for task in tasks:
+            task.cancel()
+        if tasks:
+            self._loop.run_until_complete(asyncio.gather(*tasks, return_exceptions=True))
+
+    def close(self):
+        """Tutup event loop milik assistant beserta task yang tersisa"""
+        if self._loop is not None and not self._loop.is_closed():
+            self._cancel_pending_tasks()
+            self._loop.run_until_complete(self._loop.shutdown_asyncgens())
+            self._loop.close()
+        self._loop = None
+
+    async def analyze_video_content_async(self, video_path: str, language: str = "indonesian",
+                                          executor: Optional[ThreadPoolExecutor] = None) -> Dict[str, Any]:
+        """Versi async analyze_video_content: decode frame dan request Gemini jalan di thread executor"""
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(executor, self.analyze_video_content, video_path, language)
+
+    def analyze_videos(self, video_paths: List[str], language: str = "indonesian") -> Dict[str, Dict[str, Any]]:
+        """Analisis beberapa video concurrent, decode video berikutnya overlap dengan request Gemini
+
+        Method sync: jika dipanggil dari event loop yang sedang jalan, video dianalisis satu per satu.
+        Ctrl-C membatalkan video yang belum mulai; video yang sedang dianalisis tetap selesai dulu.
+        """
+        # Path yang sama cukup dianalisis sekali
+        unique_paths = list(dict.fromkeys(video_paths))
+        
+        # Executor sendiri (bukan default loop executor) dengan worker = batas concurrency,
+        # agar antrean video yang belum jalan bisa dibuang saat dibatalkan
+        executor = ThreadPoolExecutor(max_workers=self.rate_limiter.max_concurrency,
+                                      thread_name_prefix="gemini-analyze")
+        
+        async def analyze_all():
+            return await asyncio.gather(*[
+                self.analyze_video_content_async(video_path, language, executor) for video_path in unique_paths
+            ])
+        
+        def analyze_all_sync():
+            return [self.analyze_video_content(video_path, language) for video_path in unique_paths]
+        
+        try:
+            return dict(zip(unique_paths, self._run_async(analyze_all(), analyze_all_sync)))
+        finally:
+            if sys.version_info >= (3, 9):
+                executor.shutdown(wait=False, cancel_futures=True)
+            else:
+                executor.shutdown(wait=False)
+
+    async def _generate_platform_content_async(self, prompt_template: str, analysis_json: str,
+                                               platform: str, language: str) -> Optional[Dict[str, Any]]:
+        """Generate content untuk satu platform via generate_content_async, None jika gagal"""
+        self._log(f"🚀 Generating advanced content untuk {platform} dengan Gemini 2.0-flash...", "AI")
+        prompt = self._platform_prompt(prompt_template, analysis_json, platform)
+        
+        try:
+            response = await self._generate_async(self.model, prompt)
+            return self._parse_gemini_json(response.text)
+            
+        except Exception as e:
+            self._log(f"Error generating content for {platform}: {e}", "WARNING")
+            return None
+
+    def _generate_platform_content_sync(self, analysis_json: str, platforms: List[str],
+                                        language: str) -> Dict[str, Any]:
+        """Generate content platform satu per satu (tanpa event loop), None per platform jika gagal"""
+        prompt_template = _PLATFORM_PROMPT_EN if language == "english" else _PLATFORM_PROMPT_ID
+        results = {}
+        for platform in platforms:
+            self._log(f"🚀 Generating advanced content untuk {platform} dengan Gemini 2.0-flash...", "AI")
+            try:
+                response = self._generate(self.model, self._platform_prompt(prompt_template, analysis_json, platform))
+                results[platform] = self._parse_gemini_json(response.text)
+            except Exception as e:
+                self._log(f"Error generating content for {platform}: {e}", "WARNING")
+                results[platform] = None
+        return results
+
+    @staticmethod
+    def _platform_prompt(prompt_template: str, analysis_json: str, platform: str) -> str:
+        """Enhanced prompt untuk Gemini 2.0-flash dengan advanced content generation"""
+        return prompt_template.format_map({
+            "platform": platform,
+            "platform_upper": platform.upper(),
+            "analysis_json": analysis_json
+        })
+
+    async def _gather_platform_content(self, analysis_json: str, platforms: List[str],
+                                       language: str) -> Dict[str, Any]:
+        """Kirim request semua platform secara concurrent"""
+        prompt_template = _PLATFORM_PROMPT_EN if language == "english" else _PLATFORM_PROMPT_ID
+        semaphore = asyncio.Semaphore(self.rate_limiter.max_concurrency)
+        
+        async def generate_one(platform: str) -> Dict[str, Any]:
+            async with semaphore:
+                return await self._generate_platform_content_async(prompt_template, analysis_json, platform, language)
+        
+        results = await asyncio.gather(*[generate_one(platform) for platform in platforms])
+        return dict(zip(platforms, results))
+
+    def _generate_multi_platform_content(self, analysis_json: str, platforms: List[str],
+                                         language: str, on_chunk=None) -> Dict[str, Any]:
+        """Generate content semua platform dalam satu request; return {} jika response tidak valid"""
+        self._log(f"🚀 Generating content untuk {', '.join(platforms)} dalam satu request...", "AI")
+        
         if language == "english":
-            return {
-                "visual_elements": {
-                    "main_subjects": ["video content"],
-                    "objects": ["various objects"],
-                    "setting": "unknown environment",
-                    "lighting": "standard lighting",
-                    "composition": "standard composition"
-                },
-                "content_analysis": {
-                    "activities": ["unknown activity"],
-                    "emotions": ["neutral"],
-                    "story_potential": 7,
-                    "engagement_hooks": ["visual content", "interesting moments"]
-                },
-                "viral_potential": {
-                    "viral_score": "7 - good potential with optimization",
-                    "trending_elements": ["engaging visuals", "shareable content"],
-                    "shareability_factors": ["interesting content", "good quality"],
-                    "meme_potential": 6
-                },
-                "platform_optimization": {
-                    "tiktok_potential": 8,
-                    "instagram_potential": 7,
-                    "youtube_potential": 7,
-                    "facebook_potential": 6
-                },
-                "content_strategy": {
-                    "target_audience": "general social media users",
-                    "content_pillars": ["entertainment", "engagement"],
-                    "call_to_action_suggestions": ["like and share", "comment below"],
-                    "hashtag_strategy": ["trending", "viral", "content"]
-                },
-                "technical_quality": {
-                    "video_quality": "good",
-                    "audio_potential": "standard",
-                    "editing_suggestions": ["add trending music", "optimize for mobile"]
-                }
-            }
+            prompt_template = _PLATFORM_PROMPT_EN + _MULTI_PLATFORM_SUFFIX_EN
         else:
-            return {
-                "elemen_visual": {
-                    "subjek_utama": ["konten video"],
-                    "objek": ["berbagai objek"],
-                    "setting": "lingkungan tidak diketahui",
-                    "pencahayaan": "pencahayaan standar",
-                    "komposisi": "komposisi standar"
-                },
-                "analisis_konten": {
-                    "aktivitas": ["aktivitas tidak diketahui"],
-                    "emosi": ["netral"],
-                    "potensi_cerita": 7,
-                    "engagement_hooks": ["konten visual", "momen menarik"]
-                },
-                "potensi_viral": {
-                    "skor_viral": "7 - potensi bagus dengan optimasi",
-                    "elemen_trending": ["visual menarik", "konten shareable"],
-                    "faktor_shareability": ["konten menarik", "kualitas bagus"],
-                    "potensi_meme": 6
-                },
-                "optimasi_platform": {
-                    "potensi_tiktok": 8,
-                    "potensi_instagram": 7,
-                    "potensi_youtube": 7,
-                    "potensi_facebook": 6
-                },
-                "strategi_konten": {
-                    "target_audience": "pengguna media sosial umum",
-                    "pilar_konten": ["hiburan", "engagement"],
-                    "saran_call_to_action": ["like dan share", "komentar di bawah"],
-                    "strategi_hashtag": ["trending", "viral", "konten"]
-                },
-                "kualitas_teknis": {
-                    "kualitas_video": "bagus",
-                    "potensi_audio": "standar",
-                    "saran_editing": ["tambah musik trending", "optimasi untuk mobile"]
-                }
-            }
+            prompt_template = _PLATFORM_PROMPT_ID + _MULTI_PLATFORM_SUFFIX_ID
+        prompt = prompt_template.format_map({
+            "platform": ", ".join(platforms),
+            "platform_upper": ", ".join(platforms).upper(),
+            "analysis_json": analysis_json,
+            "platform_list": ", ".join(platforms),
+            "platform_keys": json.dumps(platforms)
+        })
+        
+        try:
+            response = self._generate(self.model, prompt, on_chunk)
+            result = self._parse_gemini_json(response.text)
+        except Exception as e:
+            self._log(f"Error generating combined platform content: {e}", "WARNING")
+            return {}
+        
+        if not isinstance(result, dict):
+            return {}
+        return {platform: result[platform] for platform in platforms if isinstance(result.get(platform), dict)}
+
+    @staticmethod
+    def _analysis_prompt_json(analysis: Dict[str, Any]) -> str:
+        """Serialize analysis untuk prompt platform, diringkas jika melebihi budget"""
+        # sort_keys membuat prompt dan key cache stabil walau urutan key analysis berbeda
+        analysis_json = _dumps_pretty(analysis, sort_keys=True)
+        if len(analysis_json) <= ANALYSIS_PROMPT_BUDGET_CHARS:
+            return analysis_json
+        
+        # Buang bagian yang tidak relevan untuk content platform (mis. kualitas teknis)
+        trimmed = {key: analysis[key] for key in _PLATFORM_ANALYSIS_KEYS if key in analysis} or analysis
+        analysis_json = _dumps_pretty(trimmed, sort_keys=True)
+        if len(analysis_json) <= ANALYSIS_PROMPT_BUDGET_CHARS:
+            return analysis_json
+        
+        # Masih terlalu panjang: JSON compact tanpa indentasi
+        analysis_json = _dumps(trimmed, sort_keys=True)
+        
+        # Potong string/list panjang bertahap sampai muat (mis. daftar scene yang panjang)
+        max_chars, max_items = 512, 16
+        while len(analysis_json) > ANALYSIS_PROMPT_BUDGET_CHARS and max_chars >= 16:
+            analysis_json = _dumps(_shorten_json_value(trimmed, max_chars, max_items), sort_keys=True)
+            max_chars, max_items = max_chars // 2, max(1, max_items // 2)
+        
+        # Terlalu banyak key untuk diringkas: potong teksnya langsung, budget tetap dijaga
+        return analysis_json[:ANALYSIS_PROMPT_BUDGET_CHARS]
+
+    def _get_cached_platform_content(self, analysis_json: str, platforms: List[str],
+                                     language: str) -> Dict[str, Any]:
+        """Ambil content platform yang sudah ada di cache"""
+        content = {}
+        if not self.analysis_cache:
+            return content
+        
+        for platform in platforms:
+            try:
+                cached = self.analysis_cache.get(AnalysisCache.make_content_key(analysis_json, platform, language))
+            except sqlite3.Error as e:
+                self._log(f"Content cache dilewati: {e}", "DEBUG")
+                break
+            if cached is not None:
+                self._log(f"🎯 Content {platform} diambil dari cache", "SUCCESS")
+                content[platform] = cached
+        return content
+
+    def _put_cached_platform_content(self, analysis_json: str, platform: str, language: str,
+                                     value: Dict[str, Any]):
+        """Simpan content platform hasil Gemini ke cache"""
+        if not self.analysis_cache:
+            return
+        try:
+            self.analysis_cache.put(AnalysisCache.make_content_key(analysis_json, platform, language), value)
+        except sqlite3.Error as e:
+            self._log(f"Gagal simpan content cache: {e}", "DEBUG")
 
     def generate_platform_content(self, analysis: Dict[str, Any], platforms: List[str], 
-                                language: str = "indonesian") -> Dict[str, Any]:
-        """Generate content untuk setiap platform menggunakan Gemini 2.0-flash advanced capabilities"""
+                                language: str = "indonesian", on_chunk=None) -> Dict[str, Any]:
+        """Generate content untuk setiap platform menggunakan Gemini 2.0-flash advanced capabilities
+
+        Method sync: jika dipanggil dari event loop yang sedang jalan, platform di-generate satu per satu.
+        """
         if not self.model:
             return self._generate_fallback_content(platforms, language)
         
         try:
-            content = {}
+            # Serialize analysis sekali, dipakai ulang di prompt setiap platform
+            analysis_json = self._analysis_prompt_json(analysis)
             
-            for platform in platforms:
-                self._log(f"🚀 Generating advanced content untuk {platform} dengan Gemini 2.0-flash...", "AI")
-                
-                # Enhanced prompt untuk Gemini 2.0-flash dengan advanced content generation
-                if language == "english":
-                    prompt = f"""
-                    You are a viral content creation expert powered by Gemini 2.0-flash. Create highly engaging, platform-optimized content for {platform} based on this advanced video analysis:
-                    
-                    {json.dumps(analysis, indent=2)}
-
-                    ADVANCED CONTENT GENERATION FOR {platform.upper()}:
-
-                    Platform-specific optimization:
-                    - TikTok: Viral hooks, trending sounds, youth slang, 15-60s optimization
-                    - Instagram: Aesthetic appeal, story-worthy, lifestyle integration
-                    - YouTube: SEO optimization, retention hooks, algorithm-friendly
-                    - Facebook: Community engagement, discussion starters, shareability
-
-                    GENERATE PERFECT JSON with these enhanced keys:
-                    {{
-                      "title_variations": [
-                        {{
-                          "type": "viral_hook",
-                          "title": "attention-grabbing viral title",
-                          "hook_type": "curiosity/shock/emotion"
-                        }},
-                        {{
-                          "type": "question_format", 
-                          "title": "engaging question title",
-                          "engagement_trigger": "specific trigger"
-                        }},
-                        {{
-                          "type": "trending_format",
-                          "title": "trending format title", 
-                          "trend_element": "current trend used"
-                        }}
-                      ],
-                      "description_options": [
-                        {{
-                          "type": "storytelling",
-                          "content": "narrative-driven description",
-                          "story_arc": "beginning-middle-end structure"
-                        }},
-                        {{
-                          "type": "educational",
-                          "content": "value-providing description",
-                          "learning_outcome": "what viewers learn"
-                        }},
-                        {{
-                          "type": "entertainment",
-                          "content": "fun and engaging description",
-                          "entertainment_value": "why it's entertaining"
-                        }}
-                      ],
-                      "hashtag_strategy": {{
-                        "trending_hashtags": ["current trending tags"],
-                        "niche_hashtags": ["specific niche tags"],
-                        "branded_hashtags": ["potential brand tags"],
-                        "location_hashtags": ["location-based tags"],
-                        "optimal_count": "recommended number for platform"
-                      }},
-                      "engagement_optimization": {{
-                        "hook_timing": "when to place hook (seconds)",
-                        "cta_placement": "optimal CTA placement",
-                        "interaction_triggers": ["specific engagement triggers"],
-                        "retention_tactics": ["keep viewers watching"]
-                      }},
-                      "viral_elements": {{
-                        "trending_sounds": ["suggested trending audio"],
-                        "visual_effects": ["recommended effects"],
-                        "editing_style": "optimal editing approach",
-                        "posting_strategy": "best time and frequency"
-                      }}
-                    }}
-                    """
-                else:
-                    prompt = f"""
-                    Anda adalah expert pembuatan konten viral yang didukung Gemini 2.0-flash. Buat konten yang sangat engaging dan dioptimasi untuk {platform} berdasarkan analisis video lanjutan ini:
-                    
-                    {json.dumps(analysis, indent=2)}
-
-                    GENERASI KONTEN LANJUTAN UNTUK {platform.upper()}:
-
-                    Optimasi spesifik platform:
-                    - TikTok: Hook viral, trending sounds, bahasa anak muda, optimasi 15-60s
-                    - Instagram: Daya tarik estetik, story-worthy, integrasi lifestyle
-                    - YouTube: Optimasi SEO, retention hooks, algorithm-friendly
-                    - Facebook: Community engagement, discussion starters, shareability
-
-                    GENERATE JSON SEMPURNA dengan keys yang ditingkatkan:
-                    {{
-                      "variasi_judul": [
-                        {{
-                          "tipe": "viral_hook",
-                          "judul": "judul viral yang menarik perhatian",
-                          "tipe_hook": "curiosity/shock/emotion"
-                        }},
-                        {{
-                          "tipe": "format_pertanyaan",
-                          "judul": "judul pertanyaan yang engaging", 
-                          "trigger_engagement": "trigger spesifik"
-                        }},
-                        {{
-                          "tipe": "format_trending",
-                          "judul": "judul format trending",
-                          "elemen_trend": "trend terkini yang digunakan"
-                        }}
-                      ],
-                      "opsi_deskripsi": [
-                        {{
-                          "tipe": "storytelling",
-                          "konten": "deskripsi berbasis narasi",
-                          "alur_cerita": "struktur awal-tengah-akhir"
-                        }},
-                        {{
-                          "tipe": "edukatif",
-                          "konten": "deskripsi yang memberikan value",
-                          "hasil_pembelajaran": "apa yang dipelajari viewer"
-                        }},
-                        {{
-                          "tipe": "hiburan",
-                          "konten": "deskripsi fun dan engaging",
-                          "nilai_hiburan": "mengapa menghibur"
-                        }}
-                      ],
-                      "strategi_hashtag": {{
-                        "hashtag_trending": ["tag trending saat ini"],
-                        "hashtag_niche": ["tag niche spesifik"],
-                        "hashtag_branded": ["potential brand tags"],
-                        "hashtag_lokasi": ["tag berbasis lokasi"],
-                        "jumlah_optimal": "jumlah yang direkomendasikan untuk platform"
-                      }},
-                      "optimasi_engagement": {{
-                        "timing_hook": "kapan menempatkan hook (detik)",
-                        "penempatan_cta": "penempatan CTA optimal",
-                        "trigger_interaksi": ["trigger engagement spesifik"],
-                        "taktik_retention": ["menjaga viewer tetap menonton"]
-                      }},
-                      "elemen_viral": {{
-                        "trending_sounds": ["audio trending yang disarankan"],
-                        "efek_visual": ["efek yang direkomendasikan"],
-                        "gaya_editing": "pendekatan editing optimal",
-                        "strategi_posting": "waktu dan frekuensi terbaik"
-                      }}
-                    }}
-                    """
-                
-                try:
-                    response = self.model.generate_content(prompt)
-                    response_text = response.text
-                    
-                    # Extract JSON
-                    if "```json" in response_text:
-                        json_start = response_text.find("```json") + 7
-                        json_end = response_text.find("```", json_start)
-                        json_text = response_text[json_start:json_end].strip()
-                    else:
-                        json_text = response_text
-                    
-                    platform_content = json.loads(json_text)
-                    content[platform] = platform_content
-                    
-                except (json.JSONDecodeError, Exception) as e:
-                    self._log(f"Error generating content for {platform}: {e}", "WARNING")
+            content = self._get_cached_platform_content(analysis_json, platforms, language)
+            pending = [platform for platform in platforms if platform not in content]
+            
+            generated = {}
+            if len(pending) > 1:
+                generated = self._generate_multi_platform_content(analysis_json, pending, language, on_chunk)
+            
+            # Platform yang tidak ada di response gabungan di-request satu per satu secara concurrent
+            missing = [platform for platform in pending if platform not in generated]
+            if missing:
+                generated.update(self._run_async(
+                    self._gather_platform_content(analysis_json, missing, language),
+                    functools.partial(self._generate_platform_content_sync, analysis_json, missing, language)
+                ))
+            
+            for platform in pending:
+                if generated.get(platform) is None:
                     content[platform] = self._generate_fallback_platform_content(platform, language)
+                else:
+                    content[platform] = generated[platform]
+                    self._put_cached_platform_content(analysis_json, platform, language, generated[platform])
+            content = {platform: content[platform] for platform in platforms}
             
             self._log(f"🎯 Advanced content generation dengan Gemini 2.0-flash selesai", "SUCCESS")
             return content
@@ -628,170 +1928,59 @@ class GeminiAIAssistant:
 
     def _generate_fallback_platform_content(self, platform: str, language: str = "indonesian") -> Dict[str, Any]:
         """Generate fallback content untuk platform tertentu dengan language support"""
-        if language == "english":
-            base_content = {
-                "tiktok": {
-                    "title_variations": [
-                        {"type": "viral_hook", "title": "This Video Will Blow Your Mind! 🔥", "hook_type": "curiosity"},
-                        {"type": "question_format", "title": "Why Is Everyone Talking About This?", "engagement_trigger": "curiosity"},
-                        {"type": "trending_format", "title": "POV: You Discover This Amazing Thing", "trend_element": "POV format"}
-                    ],
-                    "description_options": [
-                        {"type": "storytelling", "content": "Amazing content that will change your perspective! Tag someone who needs to see this.", "story_arc": "discovery-revelation-impact"},
-                        {"type": "educational", "content": "Learn something new today with this incredible content!", "learning_outcome": "new knowledge"},
-                        {"type": "entertainment", "content": "Pure entertainment that will make your day better!", "entertainment_value": "mood boost"}
-                    ],
-                    "hashtag_strategy": {
-                        "trending_hashtags": ["#fyp", "#viral", "#trending"],
-                        "niche_hashtags": ["#amazing", "#wow", "#mindblowing"],
-                        "branded_hashtags": ["#tiktok", "#video"],
-                        "location_hashtags": ["#worldwide"],
-                        "optimal_count": "5-8 hashtags"
-                    }
-                }
-            }
-        else:
-            base_content = {
-                "tiktok": {
-                    "variasi_judul": [
-                        {"tipe": "viral_hook", "judul": "Video Viral yang Bikin Jutaan Views! 🔥", "tipe_hook": "curiosity"},
-                        {"tipe": "format_pertanyaan", "judul": "Kenapa Video Ini Bisa Trending #1?", "trigger_engagement": "curiosity"},
-                        {"tipe": "format_trending", "judul": "POV: Kamu Nemuin Hal Amazing Ini", "elemen_trend": "POV format"}
-                    ],
-                    "opsi_deskripsi": [
-                        {"tipe": "storytelling", "konten": "Konten amazing yang akan mengubah perspektif kamu! Tag bestie yang perlu lihat ini.", "alur_cerita": "penemuan-revelasi-dampak"},
-                        {"tipe": "edukatif", "konten": "Belajar hal baru hari ini dengan konten incredible ini!", "hasil_pembelajaran": "pengetahuan baru"},
-                        {"tipe": "hiburan", "konten": "Hiburan murni yang akan membuat hari kamu lebih baik!", "nilai_hiburan": "mood boost"}
-                    ],
-                    "strategi_hashtag": {
-                        "hashtag_trending": ["#fyp", "#viral", "#trending"],
-                        "hashtag_niche": ["#amazing", "#wow", "#keren"],
-                        "hashtag_branded": ["#tiktok", "#video"],
-                        "hashtag_lokasi": ["#indonesia"],
-                        "jumlah_optimal": "5-8 hashtag"
-                    }
-                }
-            }
-        
-        return base_content.get(platform, base_content["tiktok"])
+        base_content = _FALLBACK_PLATFORM_CONTENT_JSON["english" if language == "english" else "indonesian"]
+        return _loads(base_content.get(platform, base_content["tiktok"]))
 
-    def generate_text_post(self, topic: str, platform: str, language: str = "indonesian") -> Dict[str, Any]:
+    def generate_text_post(self, topic: str, platform: str, language: str = "indonesian",
+                           on_chunk=None, force_refresh: bool = False) -> Dict[str, Any]:
         """Generate text post berdasarkan topik menggunakan Gemini 2.0-flash"""
         if not self.model:
             return self._generate_fallback_text_post(topic, platform, language)
         
+        # Topik + platform yang sama baru saja di-generate: pakai hasil cache
+        cache_key = None
+        embedding = None
+        embedding_namespace = AnalysisCache.make_embedding_namespace(platform, language)
+        if self.analysis_cache:
+            cache_key = AnalysisCache.make_text_key(topic, platform, language)
+            if not force_refresh:
+                try:
+                    cached = self.analysis_cache.get(cache_key)
+                    if cached is not None:
+                        self._log("🎯 Text post diambil dari cache", "SUCCESS")
+                        return cached
+                except sqlite3.Error as e:
+                    self._log(f"Text post cache dilewati: {e}", "DEBUG")
+            
+            # Topik mirip secara semantik: satu embedding request jauh lebih murah dari generate
+            embedding = self._embed_topic(topic)
+            if embedding and not force_refresh:
+                try:
+                    similar = self.analysis_cache.find_semantic(embedding_namespace, embedding)
+                    if similar is not None:
+                        self._log("🎯 Text post diambil dari cache (topik mirip)", "SUCCESS")
+                        self.analysis_cache.put(cache_key, similar, ttl=TEXT_POST_CACHE_TTL)
+                        self.analysis_cache.put_embedding(cache_key, embedding_namespace, embedding)
+                        return similar
+                except sqlite3.Error as e:
+                    self._log(f"Semantic cache dilewati: {e}", "DEBUG")
+        
         try:
             self._log(f"🚀 Generating advanced text post untuk {platform} dengan Gemini 2.0-flash...", "AI")
             
-            if language == "english":
-                prompt = f"""
-                You are a viral content strategist powered by Gemini 2.0-flash. Create an engaging text post for {platform} about: {topic}
-
-                ADVANCED TEXT POST GENERATION:
-
-                Platform guidelines:
-                - TikTok: Casual, trendy, youth-focused, hook-driven
-                - Instagram: Aesthetic, lifestyle, visual storytelling
-                - YouTube: Informative, searchable, community-building
-                - Facebook: Conversational, community-focused, discussion-starter
-
-                Generate PERFECT JSON with enhanced structure:
-                {{
-                  "content_variations": [
-                    {{
-                      "style": "viral_hook",
-                      "content": "attention-grabbing content with hook",
-                      "engagement_factor": "why it's engaging"
-                    }},
-                    {{
-                      "style": "storytelling", 
-                      "content": "narrative-driven content",
-                      "story_element": "story component used"
-                    }},
-                    {{
-                      "style": "educational",
-                      "content": "value-providing content",
-                      "value_proposition": "what value it provides"
-                    }}
-                  ],
-                  "hashtag_strategy": {{
-                    "primary_hashtags": ["main topic hashtags"],
-                    "trending_hashtags": ["current trending hashtags"],
-                    "engagement_hashtags": ["hashtags that drive engagement"]
-                  }},
-                  "call_to_action": {{
-                    "primary_cta": "main call to action",
-                    "secondary_cta": "backup call to action",
-                    "engagement_type": "type of engagement expected"
-                  }},
-                  "optimization_tips": {{
-                    "best_posting_time": "optimal posting time",
-                    "engagement_tactics": ["specific tactics to boost engagement"],
-                    "viral_potential": "viral potential score 1-10"
-                  }}
-                }}
-                """
-            else:
-                prompt = f"""
-                Anda adalah viral content strategist yang didukung Gemini 2.0-flash. Buat text post yang engaging untuk {platform} tentang: {topic}
-
-                GENERASI TEXT POST LANJUTAN:
-
-                Panduan platform:
-                - TikTok: Casual, trendy, youth-focused, hook-driven
-                - Instagram: Aesthetic, lifestyle, visual storytelling
-                - YouTube: Informatif, searchable, community-building
-                - Facebook: Conversational, community-focused, discussion-starter
-
-                Generate JSON SEMPURNA dengan struktur yang ditingkatkan:
-                {{
-                  "variasi_konten": [
-                    {{
-                      "gaya": "viral_hook",
-                      "konten": "konten menarik perhatian dengan hook",
-                      "faktor_engagement": "mengapa engaging"
-                    }},
-                    {{
-                      "gaya": "storytelling",
-                      "konten": "konten berbasis narasi", 
-                      "elemen_cerita": "komponen cerita yang digunakan"
-                    }},
-                    {{
-                      "gaya": "edukatif",
-                      "konten": "konten yang memberikan value",
-                      "proposisi_nilai": "value apa yang diberikan"
-                    }}
-                  ],
-                  "strategi_hashtag": {{
-                    "hashtag_utama": ["hashtag topik utama"],
-                    "hashtag_trending": ["hashtag trending saat ini"],
-                    "hashtag_engagement": ["hashtag yang mendorong engagement"]
-                  }},
-                  "call_to_action": {{
-                    "cta_utama": "call to action utama",
-                    "cta_sekunder": "call to action cadangan",
-                    "tipe_engagement": "jenis engagement yang diharapkan"
-                  }},
-                  "tips_optimasi": {{
-                    "waktu_posting_terbaik": "waktu posting optimal",
-                    "taktik_engagement": ["taktik spesifik untuk boost engagement"],
-                    "potensi_viral": "skor potensi viral 1-10"
-                  }}
-                }}
-                """
-            
-            response = self.model.generate_content(prompt)
-            response_text = response.text
+            prompt_template = _TEXT_POST_PROMPT_EN if language == "english" else _TEXT_POST_PROMPT_ID
+            prompt = prompt_template.format_map({"platform": platform, "topic": topic})
             
-            # Extract JSON
-            if "```json" in response_text:
-                json_start = response_text.find("```json") + 7
-                json_end = response_text.find("```", json_start)
-                json_text = response_text[json_start:json_end].strip()
-            else:
-                json_text = response_text
+            response = self._generate(self.model, prompt, on_chunk)
+            post_content = self._parse_gemini_json(response.text)
             
-            post_content = json.loads(json_text)
+            if cache_key:
+                try:
+                    self.analysis_cache.put(cache_key, post_content, ttl=TEXT_POST_CACHE_TTL)
+                    if embedding:
+                        self.analysis_cache.put_embedding(cache_key, embedding_namespace, embedding)
+                except sqlite3.Error as e:
+                    self._log(f"Gagal simpan text post cache: {e}", "DEBUG")
             
             self._log(f"🎯 Advanced text post generation dengan Gemini 2.0-flash selesai", "SUCCESS")
             return post_content
@@ -800,8 +1989,32 @@ class GeminiAIAssistant:
             self._log(f"Error generating text post: {e}", "ERROR")
             return self._generate_fallback_text_post(topic, platform, language)
 
+    def _embed_topic(self, topic: str) -> Optional[List[float]]:
+        """Embedding topic untuk semantic cache, None jika tidak tersedia"""
+        if self.cache_mode != "enabled":
+            return None
+        text = topic.strip().lower()
+        
+        # Lewat rate limiter (RPM/TPM + AIMD) seperti request generate lain
+        def call():
+            self.rate_limiter.acquire(self._estimate_tokens(text))
+            try:
+                return genai.embed_content(model=EMBEDDING_MODEL, content=text, task_type="semantic_similarity")
+            except Exception as e:
+                self._note_api_error(e)
+                raise
+        
+        try:
+            # Embedding hanya optimasi cache: budget retry pendek, lebih baik langsung generate
+            result = self._retry(call, max_wait=STATUS_RETRY_MAX_WAIT)
+            return result["embedding"]
+        except Exception as e:
+            self._log(f"Embedding topic gagal, semantic cache dilewati: {e}", "DEBUG")
+            return None
+
     def _generate_fallback_text_post(self, topic: str, platform: str, language: str = "indonesian") -> Dict[str, Any]:
         """Generate fallback text post dengan language support"""
+        topic_tag = "#" + topic.replace(" ", "")
         if language == "english":
             return {
                 "content_variations": [
@@ -812,7 +2025,7 @@ class GeminiAIAssistant:
                     }
                 ],
                 "hashtag_strategy": {
-                    "primary_hashtags": [f"#{topic.replace(' ', '')}", "#tips", "#amazing"],
+                    "primary_hashtags": [topic_tag, "#tips", "#amazing"],
                     "trending_hashtags": ["#viral", "#trending"],
                     "engagement_hashtags": ["#share", "#comment"]
                 },
@@ -832,7 +2045,7 @@ class GeminiAIAssistant:
                     }
                 ],
                 "strategi_hashtag": {
-                    "hashtag_utama": [f"#{topic.replace(' ', '')}", "#tips", "#amazing"],
+                    "hashtag_utama": [topic_tag, "#tips", "#amazing"],
                     "hashtag_trending": ["#viral", "#trending"],
                     "hashtag_engagement": ["#share", "#komentar"]
                 },
@@ -843,7 +2056,7 @@ class GeminiAIAssistant:
                 }
             }
 
-    def check_api_status(self) -> Dict[str, Any]:
+    def check_api_status(self, force: bool = False) -> Dict[str, Any]:
         """Check Gemini 2.0-flash API status"""
         if not GENAI_AVAILABLE:
             return {
@@ -857,15 +2070,35 @@ class GeminiAIAssistant:
             return {
                 "success": False,
                 "error": "API key not configured",
-                "message": "Buat file .env dengan GEMINI_API_KEY=your_actual_api_key"
+                "message": _API_KEY_HINT
             }
         
+        # Mode replay tidak boleh memanggil API: laporkan mode-nya, jangan di-cache sebagai gagal
+        if self.cache_mode == "replay":
+            return {
+                "success": False,
+                "replay": True,
+                "error": "GEMINI_CACHE_MODE=replay",
+                "message": "GEMINI_CACHE_MODE=replay aktif: API tidak dicek, hanya hasil cache yang dipakai"
+            }
+        
+        # Hasil probe di-cache: 5 menit jika sukses, 30 detik jika gagal
+        if self._api_status_cache and not force:
+            checked_at, status = self._api_status_cache
+            ttl = API_STATUS_TTL if status["success"] else API_STATUS_FAILURE_TTL
+            if time.monotonic() - checked_at < ttl:
+                return status
+        
+        status = self._probe_api_status(api_key)
+        self._api_status_cache = (time.monotonic(), status)
+        return status
+
+    def _probe_api_status(self, api_key: str) -> Dict[str, Any]:
+        """Test koneksi ke Gemini dengan request kecil"""
         try:
-            genai.configure(api_key=api_key)
-            
-            # Test with Gemini 2.0-flash
-            model = genai.GenerativeModel('gemini-2.0-flash-exp')
-            response = model.generate_content("Test connection")
+            # Test with Gemini 2.0-flash (handle yang sama dengan self.model, koneksinya dipakai ulang)
+            model = _get_model(api_key, 'gemini-2.0-flash-exp')
+            response = self._generate(model, "Test connection", max_wait=STATUS_RETRY_MAX_WAIT)
             
             return {
                 "success": True,
@@ -883,8 +2116,8 @@ class GeminiAIAssistant:
         except Exception as e:
             try:
                 # Fallback test
-                model = genai.GenerativeModel('gemini-pro')
-                response = model.generate_content("Test")
+                model = _get_model(api_key, 'gemini-pro')
+                response = self._generate(model, "Test", max_wait=STATUS_RETRY_MAX_WAIT)
                 
                 return {
                     "success": True,
@@ -902,10 +2135,16 @@ class GeminiAIAssistant:
     def cleanup_temp_files(self):
         """Cleanup temporary files"""
         try:
-            import shutil
             if self.temp_dir.exists():
-                for file_path in self.temp_dir.glob("frame_*.jpg"):
-                    file_path.unlink()
+                with os.scandir(self.temp_dir) as entries:
+                    for entry in entries:
+                        # .tmp: sisa atomic write (_save_frame / ffmpeg) yang terputus
+                        if (entry.name.startswith("frame_") and entry.name.endswith((".jpg", ".tmp"))
+                                and entry.is_file(follow_symlinks=False)):
+                            try:
+                                os.unlink(entry.path)
+                            except OSError as e:
+                                self._log(f"Gagal hapus {entry.name}: {e}", "DEBUG")
                 self._log("Temp files cleaned up", "SUCCESS")
         except Exception as e:
             self._log(f"Error cleaning temp files: {e}", "ERROR")
@@ -919,93 +2158,99 @@ class GeminiAIAssistant:
         
         if not self.model:
             print(f"{Fore.RED}❌ Gemini AI tidak tersedia!")
-            print(f"{Fore.YELLOW}Buat file .env dengan GEMINI_API_KEY=your_api_key")
+            print(f"{Fore.YELLOW}{_API_KEY_HINT}")
             return
         
-        print(f"\n{Fore.LIGHTMAGENTA_EX}🚀 Gemini 2.0-flash AI Assistant")
-        print("=" * 60)
-        print(f"{Fore.LIGHTCYAN_EX}🎯 Powered by Latest & Most Advanced AI Model")
-        print()
+        sys.stdout.write(_MENU_HEADER)
         
         while True:
-            print(f"\n{Fore.YELLOW}Pilih aksi:")
-            print("1. 🎬 Advanced Video Analysis")
-            print("2. ✍️ Enhanced Text Post Generation")
-            print("3. 📱 Multi-Platform Content Strategy")
-            print("4. 🔍 Check API Status & Capabilities")
-            print("5. 🧹 Cleanup Temp Files")
-            print("6. ❌ Keluar")
+            sys.stdout.write(_MENU_BANNER)
             
-            choice = input(f"\n{Fore.WHITE}Pilihan (1-6): ").strip()
+            choice = input(_MENU_PROMPT).strip()
             
-            if choice == "1":
-                video_path = input(f"{Fore.CYAN}Path ke video: ").strip()
-                if os.path.exists(video_path):
-                    language = "english" if input(f"{Fore.CYAN}Language (en/id): ").strip().lower() == "en" else "indonesian"
-                    analysis = self.analyze_video_content(video_path, language)
-                    
-                    print(f"\n{Fore.GREEN}🎯 ADVANCED VIDEO ANALYSIS (Gemini 2.0-flash):")
-                    print(json.dumps(analysis, indent=2, ensure_ascii=False))
-                else:
-                    print(f"{Fore.RED}❌ File video tidak ditemukan!")
-            
-            elif choice == "2":
-                topic = input(f"{Fore.CYAN}Topik: ").strip()
-                platform = input(f"{Fore.CYAN}Platform (tiktok/instagram/youtube/facebook): ").strip()
-                if topic and platform:
-                    language = "english" if input(f"{Fore.CYAN}Language (en/id): ").strip().lower() == "en" else "indonesian"
-                    post = self.generate_text_post(topic, platform, language)
-                    
-                    print(f"\n{Fore.GREEN}🎯 ENHANCED TEXT POST (Gemini 2.0-flash):")
-                    print(json.dumps(post, indent=2, ensure_ascii=False))
-                else:
-                    print(f"{Fore.RED}❌ Topik dan platform harus diisi!")
-            
-            elif choice == "3":
-                video_path = input(f"{Fore.CYAN}Path ke video: ").strip()
-                if os.path.exists(video_path):
-                    platforms = input(f"{Fore.CYAN}Platforms (comma separated): ").strip().split(',')
-                    platforms = [p.strip() for p in platforms if p.strip()]
-                    
-                    if platforms:
-                        language = "english" if input(f"{Fore.CYAN}Language (en/id): ").strip().lower() == "en" else "indonesian"
-                        analysis = self.analyze_video_content(video_path, language)
-                        content = self.generate_platform_content(analysis, platforms, language)
-                        
-                        print(f"\n{Fore.GREEN}🎯 MULTI-PLATFORM STRATEGY (Gemini 2.0-flash):")
-                        print(json.dumps(content, indent=2, ensure_ascii=False))
-                    else:
-                        print(f"{Fore.RED}❌ Minimal satu platform harus dipilih!")
-                else:
-                    print(f"{Fore.RED}❌ File video tidak ditemukan!")
+            if choice not in self._menu_handlers:
+                self._menu_invalid()
+                continue
             
-            elif choice == "4":
-                status = self.check_api_status()
-                if status["success"]:
-                    print(f"{Fore.GREEN}✅ {status['message']}")
-                    print(f"Model: {status['model']}")
-                    if "capabilities" in status:
-                        print(f"\n🚀 Advanced Capabilities:")
-                        for capability in status["capabilities"]:
-                            print(f"  • {capability}")
-                else:
-                    print(f"{Fore.RED}❌ {status['message']}")
+            if self._menu_handlers[choice]() == "exit":
+                break
+
+    def _menu_choice_1(self):
+        """Menu: analisis video"""
+        video_path = input(f"{Fore.CYAN}Path ke video: ").strip()
+        if _file_exists(video_path):
+            language = "english" if input(f"{Fore.CYAN}Language (en/id): ").strip().lower() == "en" else "indonesian"
+            analysis = self.analyze_video_content(video_path, language, self._stream_preview())
             
-            elif choice == "5":
-                self.cleanup_temp_files()
+            _print_result("🎯 ADVANCED VIDEO ANALYSIS (Gemini 2.0-flash):", analysis)
+        else:
+            print(f"{Fore.RED}❌ File video tidak ditemukan!")
+
+    def _menu_choice_2(self):
+        """Menu: generate text post"""
+        topic = input(f"{Fore.CYAN}Topik: ").strip()
+        platform = input(f"{Fore.CYAN}Platform (tiktok/instagram/youtube/facebook): ").strip()
+        if topic and platform:
+            language = "english" if input(f"{Fore.CYAN}Language (en/id): ").strip().lower() == "en" else "indonesian"
+            post = self.generate_text_post(topic, platform, language, self._stream_preview())
             
-            elif choice == "6":
-                print(f"{Fore.YELLOW}👋 Sampai jumpa!")
-                break
+            _print_result("🎯 ENHANCED TEXT POST (Gemini 2.0-flash):", post)
+        else:
+            print(f"{Fore.RED}❌ Topik dan platform harus diisi!")
+
+    def _menu_choice_3(self):
+        """Menu: konten multi-platform"""
+        video_path = input(f"{Fore.CYAN}Path ke video: ").strip()
+        if _file_exists(video_path):
+            platforms = input(f"{Fore.CYAN}Platforms (comma separated): ").strip().split(',')
+            platforms = [p.strip() for p in platforms if p.strip()]
             
+            if platforms:
+                language = "english" if input(f"{Fore.CYAN}Language (en/id): ").strip().lower() == "en" else "indonesian"
+                analysis = self.analyze_video_content(video_path, language, self._stream_preview())
+                content = self.generate_platform_content(analysis, platforms, language, self._stream_preview())
+                
+                _print_result("🎯 MULTI-PLATFORM STRATEGY (Gemini 2.0-flash):", content)
             else:
-                print(f"{Fore.RED}❌ Pilihan tidak valid!")
+                print(f"{Fore.RED}❌ Minimal satu platform harus dipilih!")
+        else:
+            print(f"{Fore.RED}❌ File video tidak ditemukan!")
 
+    def _menu_choice_4(self):
+        """Menu: cek status API"""
+        status = self.check_api_status()
+        if status["success"]:
+            print(f"{Fore.GREEN}✅ {status['message']}")
+            print(f"Model: {status['model']}")
+            if "capabilities" in status:
+                print(f"\n🚀 Advanced Capabilities:")
+                for capability in status["capabilities"]:
+                    print(f"  • {capability}")
+        else:
+            print(f"{Fore.RED}❌ {status['message']}")
+
+    def _menu_choice_5(self):
+        """Menu: cleanup temp files dan cache expired"""
+        self.cleanup_temp_files()
+        if self.analysis_cache:
+            removed = self.analysis_cache.cleanup_expired()
+            self._log(f"{removed} analysis cache expired dihapus", "SUCCESS")
+
+    def _menu_exit(self) -> str:
+        """Menu: keluar"""
+        print(f"{Fore.YELLOW}👋 Sampai jumpa!")
+        return "exit"
+
+    def _menu_invalid(self):
+        """Pilihan menu tidak dikenal"""
+        print(f"{Fore.RED}❌ Pilihan tidak valid!")
 
 def main():
     """Main function untuk CLI"""
+    import argparse
+    
     parser = argparse.ArgumentParser(description="Gemini 2.0-flash AI Assistant")
-    parser.add_argument("--video", "-v", help="Path ke video untuk analisis")
+    parser.add_argument("--video", "-v", nargs="+", help="Path ke video untuk analisis (boleh lebih dari satu)")
     parser.add_argument("--topic", "-t", help="Topik untuk text post")
     parser.add_argument("--platform", "-p", help="Platform target")
     parser.add_argument("--language", "-l", choices=['indonesian', 'english'], 
@@ -1022,6 +2267,14 @@ def main():
     
     assistant = GeminiAIAssistant(debug=args.debug)
     
+    try:
+        _run_cli(assistant, args)
+    finally:
+        assistant.close()
+
+
+def _run_cli(assistant: GeminiAIAssistant, args):
+    """Jalankan aksi CLI sesuai argumen"""
     if args.check_api:
         status = assistant.check_api_status()
         if status["success"]:
@@ -1036,24 +2289,30 @@ def main():
         return
     
     if args.video:
-        if not os.path.exists(args.video):
-            print(f"{Fore.RED}❌ Video file not found: {args.video}")
-            sys.exit(1)
-        
-        analysis = assistant.analyze_video_content(args.video, args.language)
-        print(f"\n{Fore.GREEN}🎯 ADVANCED VIDEO ANALYSIS (Gemini 2.0-flash):")
-        print(json.dumps(analysis, indent=2, ensure_ascii=False))
-        
-        if args.platform:
-            platforms = [p.strip() for p in args.platform.split(',')]
-            content = assistant.generate_platform_content(analysis, platforms, args.language)
-            print(f"\n{Fore.GREEN}🎯 GENERATED CONTENT:")
-            print(json.dumps(content, indent=2, ensure_ascii=False))
+        for video_path in args.video:
+            if not _file_exists(video_path):
+                print(f"{Fore.RED}❌ Video file not found: {video_path}")
+                sys.exit(1)
+        
+        if len(args.video) == 1:
+            analyses = {args.video[0]: assistant.analyze_video_content(args.video[0], args.language)}
+        else:
+            analyses = assistant.analyze_videos(args.video, args.language)
+        
+        for video_path, analysis in analyses.items():
+            title = "🎯 ADVANCED VIDEO ANALYSIS (Gemini 2.0-flash):"
+            if len(analyses) > 1:
+                title += f" {Path(video_path).name}"
+            _print_result(title, analysis)
+            
+            if args.platform:
+                platforms = [p.strip() for p in args.platform.split(',')]
+                content = assistant.generate_platform_content(analysis, platforms, args.language)
+                _print_result("🎯 GENERATED CONTENT:", content)
     
     elif args.topic and args.platform:
         post = assistant.generate_text_post(args.topic, args.platform, args.language)
-        print(f"\n{Fore.GREEN}🎯 ENHANCED TEXT POST (Gemini 2.0-flash):")
-        print(json.dumps(post, indent=2, ensure_ascii=False))
+        _print_result("🎯 ENHANCED TEXT POST (Gemini 2.0-flash):", post)
     
     else:
         # Interactive mode
@@ -0,0 +1,380 @@
+#!/usr/bin/env python3
+"""
+Unit test Gemini AI Assistant - Tanpa API call
+Cache, rate limiter dan parser diuji langsung, tanpa koneksi ke Gemini
+"""
+
+import asyncio
+from collections import deque
+
+import pytest
+
+import gemini_ai_assistant
+from gemini_ai_assistant import (
+    ANALYSIS_PROMPT_BUDGET_CHARS, AnalysisCache, GeminiAIAssistant, GeminiRateLimiter, _STREAM_PREVIEW_MAX_TAIL,
+    _load_video_libs,
+)
+
+
+@pytest.fixture
+def cache(tmp_path):
+    """AnalysisCache baru di direktori sementara"""
+    analysis_cache = AnalysisCache(tmp_path / "analysis.sqlite")
+    yield analysis_cache
+    analysis_cache._conn.close()
+
+
+def test_cache_entry_expires_after_ttl(cache):
+    cache.put("video", {"topic": "diet"}, ttl=60)
+    assert cache.get("video") == {"topic": "diet"}
+
+    # Mundurkan waktu simpan melewati TTL
+    cache._conn.execute("UPDATE analysis SET cached_at = cached_at - 61 WHERE key = ?", ("video",))
+    assert cache.get("video") is None
+    assert cache._conn.execute("SELECT COUNT(*) FROM analysis").fetchone()[0] == 0
+
+
+def test_cache_evicts_least_recently_used(cache):
+    cache.max_entries = 2
+    cache.put("a", {"n": 1})
+    cache.put("b", {"n": 2})
+    # "a" baru dipakai, "b" jadi entry yang paling lama tidak dipakai
+    cache._conn.execute("UPDATE analysis SET last_access = last_access - 10 WHERE key = 'b'")
+    cache._conn.execute("UPDATE analysis SET last_access = last_access - 20 WHERE key = 'a'")
+    assert cache.get("a") == {"n": 1}
+
+    cache.put("c", {"n": 3})
+
+    assert cache.get("b") is None
+    assert cache.get("a") == {"n": 1}
+    assert cache.get("c") == {"n": 3}
+
+
+def test_find_similar_hamming_threshold(cache):
+    cache.put("video", {"topic": "diet"})
+    cache.put_signature("video", "indonesian", [0x0, 0x0])
+
+    # Rata-rata jarak 3 bit per frame (2 + 4) tepat di batas, 3.5 bit tidak
+    assert cache.find_similar("indonesian", [0b11, 0b1111], max_distance=3) == {"topic": "diet"}
+    assert cache.find_similar("indonesian", [0b111, 0b1111], max_distance=3) is None
+    # Namespace (bahasa) lain atau jumlah frame berbeda tidak pernah cocok
+    assert cache.find_similar("english", [0x0, 0x0]) is None
+    assert cache.find_similar("indonesian", [0x0]) is None
+
+
+def test_rate_limiter_blocks_on_rpm_window():
+    limiter = GeminiRateLimiter(rpm=2, tpm=1000)
+    assert limiter._reserve(10) == 0
+    assert limiter._reserve(10) == 0
+    assert 59 < limiter._reserve(10) <= 60
+
+    # Request lama keluar dari window 60 detik
+    limiter._requests = deque((timestamp - 60, tokens) for timestamp, tokens in limiter._requests)
+    assert limiter._reserve(10) == 0
+
+
+def test_rate_limiter_blocks_on_tpm_window():
+    limiter = GeminiRateLimiter(rpm=10, tpm=100)
+    assert limiter._reserve(60) == 0
+    assert limiter._reserve(60) > 0
+    assert limiter._reserve(40) == 0
+
+
+def test_rate_limiter_halves_rpm_on_429():
+    limiter = GeminiRateLimiter(rpm=4, tpm=1000)
+    limiter.on_rate_limited()
+    assert limiter.rpm == pytest.approx(2.0)
+
+    assert limiter._reserve(1) == 0
+    assert limiter._reserve(1) == 0
+    assert limiter._reserve(1) > 0
+
+    for _ in range(5):
+        limiter.on_rate_limited()
+    assert limiter.rpm == 1.0
+
+
+@pytest.mark.parametrize("response_text", [
+    '```json\n{"title": "Halo", "tags": ["a"]}\n```',
+    '{"title": "Halo", "tags": ["a"]}',
+    'Berikut hasilnya: {"title": "Halo", "tags": ["a"]} Semoga membantu {lihat catatan}',
+])
+def test_parse_gemini_json(response_text):
+    assert GeminiAIAssistant._parse_gemini_json(response_text) == {"title": "Halo", "tags": ["a"]}
+
+
+def test_parse_gemini_json_rejects_text_without_json():
+    with pytest.raises(ValueError):
+        GeminiAIAssistant._parse_gemini_json("Maaf, tidak bisa")
+
+
+def test_find_semantic_threshold_boundary(cache):
+    namespace = AnalysisCache.make_embedding_namespace("tiktok", "indonesian")
+    cache.put("diet", {"topic": "diet"})
+    cache.put_embedding("diet", namespace, [1.0, 0.0])
+
+    # Vektor identik: similarity tepat 1.0, batas inklusif
+    assert cache.find_semantic(namespace, [1.0, 0.0], min_similarity=1.0) == {"topic": "diet"}
+    # cos = 0.91 lolos threshold 0.9, cos = 0.89 tidak
+    assert cache.find_semantic(namespace, [0.91, (1 - 0.91 ** 2) ** 0.5], min_similarity=0.9) == {"topic": "diet"}
+    assert cache.find_semantic(namespace, [0.89, (1 - 0.89 ** 2) ** 0.5], min_similarity=0.9) is None
+
+
+def test_find_semantic_ignores_magnitude(cache):
+    namespace = AnalysisCache.make_embedding_namespace("tiktok", "indonesian")
+    cache.put("diet", {"topic": "diet"})
+    cache.put_embedding("diet", namespace, [3.0, 4.0])
+
+    assert cache.find_semantic(namespace, [0.6, 0.8]) == {"topic": "diet"}
+
+
+def test_find_semantic_isolated_per_platform_and_language(cache):
+    cache.put("diet", {"topic": "diet"})
+    cache.put_embedding("diet", AnalysisCache.make_embedding_namespace("tiktok", "indonesian"), [1.0, 0.0])
+
+    assert cache.find_semantic(AnalysisCache.make_embedding_namespace("TikTok ", "indonesian"), [1.0, 0.0]) is not None
+    assert cache.find_semantic(AnalysisCache.make_embedding_namespace("youtube", "indonesian"), [1.0, 0.0]) is None
+    assert cache.find_semantic(AnalysisCache.make_embedding_namespace("tiktok", "english"), [1.0, 0.0]) is None
+
+
+def test_find_semantic_skips_evicted_entries(cache):
+    namespace = AnalysisCache.make_embedding_namespace("tiktok", "indonesian")
+    cache.put("diet", {"topic": "diet"})
+    cache.put_embedding("diet", namespace, [1.0, 0.0])
+    cache._conn.execute("DELETE FROM analysis WHERE key = ?", ("diet",))
+
+    assert cache.find_semantic(namespace, [1.0, 0.0]) is None
+
+
+def test_stream_preview_shows_fields_split_across_chunks(capsys):
+    on_chunk = GeminiAIAssistant._stream_preview()
+    for chunk in ('{"title": "Ha', 'lo \\"x\\""', ', "content": "abc"}'):
+        on_chunk(chunk)
+
+    output = capsys.readouterr().out
+    assert 'title: Halo "x"' in output
+    assert "content: abc" in output
+
+
+def test_stream_preview_survives_invalid_escapes(capsys):
+    on_chunk = GeminiAIAssistant._stream_preview()
+    on_chunk('{"title": "bad \\ud800", "judul": "\\x"}')
+
+    output = capsys.readouterr().out
+    assert "title: bad \\ud800" in output
+    assert "judul: \\x" in output
+
+
+def test_stream_preview_buffer_is_bounded():
+    on_chunk = GeminiAIAssistant._stream_preview()
+    for _ in range(1000):
+        on_chunk('{"views": 1234567890},')
+
+    state = next(cell.cell_contents for cell in on_chunk.__closure__ if isinstance(cell.cell_contents, dict))
+    assert len(state["buffer"]) <= _STREAM_PREVIEW_MAX_TAIL
+
+
+def test_sample_frame_indices_drops_duplicates():
+    if not _load_video_libs():
+        pytest.skip("OpenCV/numpy tidak tersedia")
+    assistant = GeminiAIAssistant.__new__(GeminiAIAssistant)
+
+    assert assistant._sample_frame_indices(3, 12) == [0, 1, 2]
+    assert assistant._sample_frame_indices(250, 3) == [0, 124, 249]
+
+
+def test_analyze_videos_falls_back_to_sync_inside_running_loop():
+    assistant = GeminiAIAssistant.__new__(GeminiAIAssistant)
+    assistant.debug = False
+    assistant._loop = None
+    assistant.rate_limiter = GeminiRateLimiter()
+    assistant.analyze_video_content = lambda video_path, language: {"video": video_path, "language": language}
+    expected = {"a.mp4": {"video": "a.mp4", "language": "english"},
+                "b.mp4": {"video": "b.mp4", "language": "english"}}
+
+    async def call_from_loop():
+        return assistant.analyze_videos(["a.mp4", "b.mp4"], "english")
+
+    try:
+        assert asyncio.run(call_from_loop()) == expected
+        assert assistant.analyze_videos(["a.mp4", "b.mp4"], "english") == expected
+    finally:
+        assistant.close()
+
+
+def test_json_model_builds_request_with_installed_sdk():
+    # Memakai SDK yang terinstall (pin requirements.txt), tanpa network: request hanya dibangun
+    pytest.importorskip("google.generativeai")
+    gemini_ai_assistant._get_model.cache_clear()
+    gemini_ai_assistant._sdk_supports_json_mode.cache_clear()
+    try:
+        model = gemini_ai_assistant._get_model("test-key", "gemini-2.0-flash-exp")
+        request = model._prepare_request(contents="ping")
+    finally:
+        gemini_ai_assistant._get_model.cache_clear()
+
+    if gemini_ai_assistant._sdk_supports_json_mode():
+        assert request.generation_config.response_mime_type == "application/json"
+
+
+def test_save_frame_removes_tmp_file_on_failure(tmp_path, monkeypatch):
+    assistant = GeminiAIAssistant.__new__(GeminiAIAssistant)
+    monkeypatch.setattr(GeminiAIAssistant, "_encode_frame", staticmethod(lambda frame_rgb: b"jpeg"))
+
+    def fail_replace(src, dst):
+        raise OSError("disk penuh")
+
+    monkeypatch.setattr(gemini_ai_assistant.os, "replace", fail_replace)
+    with pytest.raises(OSError):
+        assistant._save_frame(None, tmp_path / "frame_1_abc.jpg")
+
+    assert list(tmp_path.iterdir()) == []
+
+
+def test_cleanup_temp_files_removes_leftover_tmp_files(tmp_path):
+    assistant = GeminiAIAssistant.__new__(GeminiAIAssistant)
+    assistant.debug = False
+    assistant.temp_dir = tmp_path
+    for name in ("frame_1_abc.jpg", "frame_2_abc.tmp", "frame_003_abc.jpg.tmp", "notes.tmp"):
+        (tmp_path / name).write_bytes(b"x")
+
+    assistant.cleanup_temp_files()
+
+    assert [path.name for path in tmp_path.iterdir()] == ["notes.tmp"]
+
+
+def test_analysis_prompt_json_stays_within_budget():
+    analysis = {
+        "content_analysis": {
+            "main_topic": "diet",
+            "key_moments": [{"time": f"00:{i:02d}", "description": "adegan panjang " * 200} for i in range(60)],
+        },
+        "technical_quality": {"resolution": "1080p"},
+    }
+
+    analysis_json = GeminiAIAssistant._analysis_prompt_json(analysis)
+
+    assert len(analysis_json) <= ANALYSIS_PROMPT_BUDGET_CHARS
+    # Diringkas per string/list, bukan dipotong di tengah: JSON tetap valid
+    shortened = gemini_ai_assistant._loads(analysis_json)
+    assert shortened["content_analysis"]["main_topic"] == "diet"
+    assert shortened["content_analysis"]["key_moments"]
+    assert "technical_quality" not in shortened
+
+
+def test_decode_keeps_partial_frames_and_warns(capsys, monkeypatch):
+    assistant = GeminiAIAssistant.__new__(GeminiAIAssistant)
+    assistant.debug = False
+    monkeypatch.setattr(gemini_ai_assistant, "DECORD_AVAILABLE", True)
+    monkeypatch.setattr(gemini_ai_assistant, "AV_AVAILABLE", False)
+
+    def decord_partial(video_path, num_frames):
+        yield "frame-0"
+        yield "frame-1"
+        raise RuntimeError("decode error")
+
+    def cv2_unused(video_path, num_frames):
+        raise AssertionError("OpenCV tidak boleh dipakai jika sudah ada frame")
+
+    assistant._extract_frames_decord = decord_partial
+    assistant._extract_frames_cv2 = cv2_unused
+
+    frames = assistant._decode_and_encode_frames("video.mp4", 4, lambda index, frame_rgb: (index, frame_rgb))
+
+    assert frames == [(0, "frame-0"), (1, "frame-1")]
+    assert "2 dari 4 frame" in capsys.readouterr().out
+
+
+def test_decode_falls_back_when_backend_yields_nothing(monkeypatch):
+    assistant = GeminiAIAssistant.__new__(GeminiAIAssistant)
+    assistant.debug = False
+    monkeypatch.setattr(gemini_ai_assistant, "DECORD_AVAILABLE", True)
+    monkeypatch.setattr(gemini_ai_assistant, "AV_AVAILABLE", False)
+
+    def decord_broken(video_path, num_frames):
+        raise RuntimeError("codec tidak didukung")
+        yield
+
+    assistant._extract_frames_decord = decord_broken
+    assistant._extract_frames_cv2 = lambda video_path, num_frames: iter(["frame-0"])
+
+    frames = assistant._decode_and_encode_frames("video.mp4", 1, lambda index, frame_rgb: frame_rgb)
+
+    assert frames == ["frame-0"]
+
+
+def test_analyze_videos_analyzes_duplicate_paths_once():
+    assistant = GeminiAIAssistant.__new__(GeminiAIAssistant)
+    assistant.debug = False
+    assistant._loop = None
+    assistant.rate_limiter = GeminiRateLimiter(max_concurrency=2)
+    analyzed = []
+
+    def analyze_video_content(video_path, language):
+        analyzed.append(video_path)
+        return {"video": video_path}
+
+    assistant.analyze_video_content = analyze_video_content
+    try:
+        results = assistant.analyze_videos(["a.mp4", "b.mp4", "a.mp4"])
+    finally:
+        assistant.close()
+
+    assert sorted(analyzed) == ["a.mp4", "b.mp4"]
+    assert list(results) == ["a.mp4", "b.mp4"]
+
+
+def test_generate_retries_without_streaming_after_mid_stream_error(monkeypatch):
+    class TransientError(Exception):
+        pass
+
+    class Chunk:
+        def __init__(self, text):
+            self.text = text
+
+    class Model:
+        def __init__(self):
+            self.calls = []
+
+        def generate_content(self, contents, stream=False):
+            self.calls.append(stream)
+            if not stream:
+                return Chunk('{"title": "Halo"}')
+
+            def chunks():
+                yield Chunk('{"title": "Ha')
+                raise TransientError("503")
+            return chunks()
+
+    assistant = GeminiAIAssistant.__new__(GeminiAIAssistant)
+    assistant.debug = False
+    assistant.cache_mode = "enabled"
+    assistant.rate_limiter = GeminiRateLimiter()
+    monkeypatch.setattr(gemini_ai_assistant, "RETRYABLE_ERRORS", (TransientError,))
+    monkeypatch.setattr(gemini_ai_assistant.time, "sleep", lambda seconds: None)
+    model = Model()
+    previews = []
+
+    response = assistant._generate(model, "prompt", previews.append)
+
+    assert response.text == '{"title": "Halo"}'
+    assert model.calls == [True, False]
+    assert previews == ['{"title": "Ha']
+
+
+def test_replay_miss_skips_frame_extraction(capsys):
+    assistant = GeminiAIAssistant.__new__(GeminiAIAssistant)
+    assistant.debug = False
+    assistant.cache_mode = "replay"
+    assistant.analysis_cache = None
+    assistant.vision_model = object()
+
+    def extract_video_frame_bytes(video_path, num_frames):
+        raise AssertionError("frames tidak boleh di-extract pada replay miss")
+
+    assistant.extract_video_frame_bytes = extract_video_frame_bytes
+
+    analysis = assistant.analyze_video_content("video.mp4", "english")
+
+    assert analysis == assistant._generate_enhanced_fallback_analysis("video.mp4", "english")
+    assert "GEMINI_CACHE_MODE=replay" in capsys.readouterr().out